@@ -0,0 +1 @@
+"""Performance benchmarks (not shipped with the scraper image)."""
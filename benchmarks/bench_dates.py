@@ -0,0 +1,58 @@
+"""Compare ``pendulum.parse`` with the fast ``parse_date`` path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_dates --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import pendulum
+
+from src.events.parsers import parse_date
+
+
+def synthetic_datetimes(rows: int, seed: int = 7) -> list[str]:
+    """``datetime_local`` values as the es/v2 endpoint returns them."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, 19, 0)
+    return [
+        (base + timedelta(days=rng.randrange(365), minutes=30 * rng.randrange(12))).strftime(
+            "%Y-%m-%dT%H:%M:%S"
+        )
+        for _ in range(rows)
+    ]
+
+
+def _time(label: str, func, values: list[str]) -> float:
+    started = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  {len(values) / elapsed:12,.0f} rows/s")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    values = synthetic_datetimes(args.rows)
+    baseline = _time("pendulum.parse", lambda value: pendulum.parse(value).date(), values)
+
+    parse_date.cache_clear()
+    cold = _time("parse_date (cold cache)", parse_date, values)
+    warm = _time("parse_date (warm cache)", parse_date, values)
+
+    print(f"speedup: {baseline / cold:.1f}x cold, {baseline / warm:.1f}x warm")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""End-to-end load test of ``run_weekly_report`` against local stubs.
+
+Starts the stub ticket site, swaps Google Sheets for an ``InMemorySpreadsheet``
+with injected latency/quota errors, and runs the full pipeline with the given
+concurrency settings:
+
+    python -m benchmarks.loadtest --listings 20000 --venues 100 --latency 0.05 --error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from src.config import Settings
+from src.pipeline.weekly_report import run_weekly_report
+from src.sheets.memory import InMemorySpreadsheet
+
+from .stub_site import LISTING_PATH, StubConfig, StubSite
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the pipeline against local stubs.")
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--venues", type=int, default=50, help="Target venues to fetch.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Site latency (s).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of site 503s.")
+    parser.add_argument("--max-per-page", type=int, default=100)
+    parser.add_argument("--sheets-latency", type=float, default=0.1)
+    parser.add_argument("--sheets-error-rate", type=float, default=0.0)
+    parser.add_argument("--page-workers", type=int, default=4)
+    parser.add_argument("--venue-workers", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/s per host (0 = off).")
+    parser.add_argument(
+        "--filter-mode",
+        choices=("honour", "ignore", "empty"),
+        default="honour",
+        help="How the stub /es/v2 treats the date/type filter.",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    site = StubSite(
+        StubConfig(
+            listings=args.listings,
+            venues=args.venues,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            max_per_page=args.max_per_page,
+            filter_mode=args.filter_mode,
+        )
+    )
+    server, base_url = site.serve()
+    spreadsheet = InMemorySpreadsheet(
+        latency=args.sheets_latency, error_rate=args.sheets_error_rate
+    )
+    start = site.config.first_day
+    end = start + timedelta(days=6)
+
+    with tempfile.TemporaryDirectory(prefix="showsintown-load-") as scratch:
+        settings = Settings(
+            source_url=f"{base_url}{LISTING_PATH}",
+            spreadsheet_id="loadtest",
+            service_account_file=Path("unused.json"),
+            cache_file=Path(scratch) / "events_cache.sqlite3",
+            target_venues=tuple(site.venue_names),
+            page_workers=args.page_workers,
+            venue_workers=args.venue_workers,
+            http_rate_limit=args.rate_limit,
+            http_cache_dir=None,
+            sheet_index_file=None,
+        )
+        started = time.perf_counter()
+        try:
+            result = run_weekly_report(settings, start, end, spreadsheet=spreadsheet)
+        finally:
+            server.shutdown()
+        elapsed = time.perf_counter() - started
+
+    expected = {
+        (listing["venue"]["name"], listing["title"], listing["datetime_local"][:10])
+        for listing in site.listings
+        if listing["type"] == "Concerts"
+        and start.isoformat() <= listing["datetime_local"][:10] <= end.isoformat()
+    }
+    sheets_calls = spreadsheet.calls
+    written = len(spreadsheet.worksheet("Master").get_all_values()) - 1
+    failed_venues = [venue for venue in result.venues if not venue.ok]
+
+    print(f"elapsed            {elapsed:8.2f}s")
+    print(f"site requests      {dict(site.stats.requests)} ({site.stats.errors} injected errors)")
+    print(f"sheets calls       {sheets_calls}")
+    print(f"fetched/valid/new  {result.fetched}/{result.valid}/{result.new}")
+    print(f"rows written       {written} (expected {len(expected)})")
+    print(f"venue failures     {len(failed_venues)}")
+    return 0 if written == len(expected) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
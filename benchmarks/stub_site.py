@@ -0,0 +1,234 @@
+"""Local stand-in for the ticket site used by load tests.
+
+Serves a listing page with an embedded ``esRequest`` block, the ``/es/v2``
+pagination endpoint and ``/venues/<slug>`` pages over a synthetic dataset,
+with configurable latency, error rate and page-size limits.
+
+    python -m benchmarks.stub_site --listings 20000 --latency 0.05 --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LISTING_PATH = "/los-angeles/ca"
+
+
+@dataclass(slots=True)
+class StubConfig:
+    listings: int = 5000
+    venues: int = 50
+    days: int = 28
+    first_day: date = date(2025, 3, 3)
+    latency: float = 0.0
+    error_rate: float = 0.0
+    default_per_page: int = 50
+    max_per_page: int = 100
+    seed: int = 7
+    # How the stub treats the scraper's date/type filter: "honour" it,
+    # "ignore" it (return everything) or "empty" (accept it, return nothing).
+    # The real endpoint's filter shape is inferred, so the last two model it
+    # reading the payload differently.
+    filter_mode: str = "honour"
+
+
+@dataclass
+class StubStats:
+    requests: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+def _slug(name: str) -> str:
+    return name.lower().replace(" ", "-")
+
+
+class StubSite:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.stats = StubStats()
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self.venue_names = [f"Stub Venue {index}" for index in range(config.venues)]
+        self.listings = self._generate()
+        self._by_venue: dict[str, list[dict]] = {}
+        for listing in self.listings:
+            self._by_venue.setdefault(_slug(listing["venue"]["name"]), []).append(listing)
+
+    def _generate(self) -> list[dict]:
+        rng = random.Random(self.config.seed)
+        base = datetime.combine(self.config.first_day, datetime.min.time())
+        listings = []
+        for index in range(self.config.listings):
+            when = base + timedelta(days=rng.randrange(self.config.days), hours=19)
+            listings.append(
+                {
+                    "type": "Concerts" if rng.random() < 0.8 else "Sports",
+                    "datetime_local": when.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "title": f"Stub Artist {index}",
+                    "venue": {"name": rng.choice(self.venue_names)},
+                    "performers": [{"name": f"Stub Artist {index}"}],
+                }
+            )
+        listings.sort(key=lambda listing: listing["datetime_local"])
+        return listings
+
+    def select(self, payload: dict) -> list[dict]:
+        """Listings matching the request's ``selected`` types and ``static`` date range."""
+        types = {value.lower() for value in (payload.get("selected") or {}).get("type") or ()}
+        window = (payload.get("static") or {}).get("datetime_local") or {}
+        low, high = window.get("gte"), window.get("lte")
+        if (not types and not low and not high) or self.config.filter_mode == "ignore":
+            return self.listings
+        if self.config.filter_mode == "empty":
+            return []
+        return [
+            listing
+            for listing in self.listings
+            if (not types or listing["type"].lower() in types)
+            and (not low or listing["datetime_local"] >= low)
+            and (not high or listing["datetime_local"] <= high)
+        ]
+
+    def _delay_or_fail(self, endpoint: str) -> bool:
+        with self._lock:
+            self.stats.requests[endpoint] += 1
+            failed = self._random.random() < self.config.error_rate
+            if failed:
+                self.stats.errors += 1
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        return failed
+
+    def listing_page(self) -> str:
+        es_request = {
+            "draw": 1,
+            "perPage": self.config.default_per_page,
+            "view": {},
+            "search": {"static": {}, "preset": {}, "selected": {}},
+            "data": {"recordsFiltered": len(self.listings), "recordsTotal": len(self.listings)},
+        }
+        rows = "\n".join(
+            self._render_row(listing)
+            for listing in self.listings[: self.config.default_per_page]
+        )
+        return (
+            "<html><head><script>"
+            f"var esRequest = {json.dumps(es_request)};"
+            f"</script></head><body>{rows}</body></html>"
+        )
+
+    @staticmethod
+    def _render_row(listing: dict) -> str:
+        when = datetime.fromisoformat(listing["datetime_local"])
+        href = f"/events/{_slug(listing['title'])}-{when:%m-%d-%Y}"
+        return (
+            f'<div class="listing-item"><a class="event-row" href="{href}">'
+            '<div class="event-item event-date">'
+            f'<div class="middle">{when:%b} {when.day}</div>'
+            f'<div class="bottom">{when:%I:%M %p}</div></div>'
+            '<div class="event-item event-info">'
+            f'<div class="title">{html.escape(listing["title"])}</div>'
+            f'<div class="location">{html.escape(listing["venue"]["name"])}, Los Angeles, CA</div>'
+            "</div></a></div>"
+        )
+
+    def api_page(self, payload: dict) -> dict:
+        matching = self.select(payload)
+        requested = int(payload.get("perPage") or 0) or self.config.default_per_page
+        per_page = min(requested, self.config.max_per_page)
+        start = int(payload.get("start") or 0)
+        return {
+            "draw": payload.get("draw"),
+            "recordsTotal": len(self.listings),
+            "recordsFiltered": len(matching),
+            "data": matching[start : start + per_page],
+        }
+
+    def venue_page(self, slug: str) -> str | None:
+        if slug not in self._by_venue:
+            return None
+        es_request = {"data": {"data": self._by_venue[slug]}}
+        return f"<html><script>esRequest = {json.dumps(es_request)};</script></html>"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: str, content_type: str) -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.startswith("/venues/"):
+                    if site._delay_or_fail("venue"):
+                        return self._send(503, "unavailable", "text/plain")
+                    page = site.venue_page(self.path.split("/")[2])
+                    if page is None:
+                        return self._send(404, "not found", "text/plain")
+                    return self._send(200, page, "text/html")
+                if site._delay_or_fail("listing"):
+                    return self._send(503, "unavailable", "text/plain")
+                return self._send(200, site.listing_page(), "text/html")
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if site._delay_or_fail("api"):
+                    return self._send(503, "unavailable", "text/plain")
+                return self._send(200, json.dumps(site.api_page(payload)), "application/json")
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://{host}:{server.server_port}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the stub ticket site.")
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--venues", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-per-page", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    site = StubSite(
+        StubConfig(
+            listings=args.listings,
+            venues=args.venues,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            max_per_page=args.max_per_page,
+        )
+    )
+    server, base_url = site.serve(port=args.port)
+    print(f"Serving {len(site.listings):,} listings at {base_url}{LISTING_PATH}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
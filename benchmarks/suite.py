@@ -0,0 +1,253 @@
+"""Stage-by-stage benchmarks over synthetic es/v2 listings.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --sizes 10k,100k
+    python -m benchmarks.suite --sizes 10k,100k,1m --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 10k,100k --baseline benchmarks/baseline.json
+
+With ``--baseline`` the exit status is 1 when any stage's throughput drops by
+more than ``--tolerance`` compared to the stored numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from src.cache.storage import EventCache
+from src.canva.client import group_events_by_venue
+from src.events.batch import EventBatch
+from src.events.models import EventRecord
+from src.events.scraper import BoxOfficeTicketSalesScraper
+from src.pipeline.cleanup import _sanitize_row
+from src.sheets.client import HEADER, SheetsClient
+from src.sheets.memory import InMemorySpreadsheet
+from src.validation.events import filter_valid_batch, filter_valid_events
+
+WINDOW_START = date(2025, 1, 1)
+WINDOW_DAYS = 365
+TYPES = ("Concerts", "Concerts", "Concerts", "Sports", "Theater")
+VENUES = [f"Venue {index} &amp; Hall" for index in range(400)]
+
+
+@dataclass(slots=True)
+class StageResult:
+    stage: str
+    rows: int
+    seconds: float
+    rows_per_second: float
+    peak_mib: float | None
+
+
+@dataclass(slots=True)
+class Stage:
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], int]
+
+
+def synthetic_listings(rows: int, seed: int = 7) -> list[dict]:
+    """Listings shaped like ``/es/v2`` ``data`` entries."""
+    rng = random.Random(seed)
+    base = datetime.combine(WINDOW_START, datetime.min.time())
+    listings = []
+    for index in range(rows):
+        when = base + timedelta(days=rng.randrange(WINDOW_DAYS), hours=18 + rng.randrange(5))
+        listings.append(
+            {
+                "type": rng.choice(TYPES),
+                "datetime_local": when.strftime("%Y-%m-%dT%H:%M:%S"),
+                "title": f"Artist {index} Live",
+                "venue": {"name": rng.choice(VENUES)},
+                "performers": [{"name": f"Artist {index}"}],
+            }
+        )
+    return listings
+
+
+def _window() -> tuple[date, date]:
+    return WINDOW_START, WINDOW_START + timedelta(days=WINDOW_DAYS - 1)
+
+
+def build_stages(rows: int, scratch: Path) -> list[Stage]:
+    start, end = _window()
+    listings = synthetic_listings(rows)
+    scraper = BoxOfficeTicketSalesScraper(source_url="")
+    records = scraper._build_records_from_listings(listings, start, end)
+    half = records[: len(records) // 2]
+    sheet_rows = [
+        [
+            record.venue,
+            f" {record.event} &amp; Friends ",
+            record.date.strftime("%m/%d/%Y"),
+            record.artist,
+        ]
+        for record in records
+    ]
+
+    def fresh_cache(seed_events: list[EventRecord]) -> EventCache:
+        path = scratch / f"cache-{time.monotonic_ns()}.sqlite3"
+        cache = EventCache(path)
+        cache.record_events(seed_events)
+        return cache
+
+    def cache_filter(cache: EventCache) -> int:
+        new = cache.filter_new(records)
+        cache.record_events(new)
+        cache.close()
+        return len(records)
+
+    def seeded_sheet() -> SheetsClient:
+        spreadsheet = InMemorySpreadsheet()
+        worksheet = spreadsheet.worksheet("Master")
+        worksheet.resize(len(half) + 1, len(HEADER))
+        worksheet.cells = [list(HEADER)] + [record.to_sheet_row() for record in half]
+        return SheetsClient("benchmark", "", spreadsheet=spreadsheet)
+
+    def build(data: list[dict]) -> int:
+        scraper._build_records_from_listings(data, start, end)
+        return len(data)
+
+    def validate(data: list[EventRecord]) -> int:
+        filter_valid_events(data, start, end)
+        return len(data)
+
+    def validate_group_batch(batch: EventBatch) -> int:
+        filter_valid_batch(batch, start, end)
+        group_events_by_venue(batch)
+        return len(batch)
+
+    def upsert(client: SheetsClient) -> int:
+        client.upsert_events(records)
+        return len(records)
+
+    def sanitize(data: list[list[str]]) -> int:
+        for row in data:
+            _sanitize_row(row)
+        return len(data)
+
+    return [
+        Stage("build_records_from_listings", lambda: listings, build),
+        Stage("filter_valid_events", lambda: records, validate),
+        Stage(
+            "event_batch_validate_group",
+            lambda: EventBatch.from_records(records),
+            validate_group_batch,
+        ),
+        Stage("event_cache_filter_record", lambda: fresh_cache(half), cache_filter),
+        Stage("sheets_upsert_key_diff", seeded_sheet, upsert),
+        Stage("sanitize_row", lambda: sheet_rows, sanitize),
+    ]
+
+
+def measure(stage: Stage, track_memory: bool) -> StageResult:
+    state = stage.setup()
+    gc.collect()
+    started = time.perf_counter()
+    processed = stage.run(state)
+    seconds = time.perf_counter() - started
+
+    peak_mib = None
+    if track_memory:
+        state = stage.setup()
+        gc.collect()
+        tracemalloc.start()
+        stage.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mib = peak / (1024 * 1024)
+
+    return StageResult(
+        stage=stage.name,
+        rows=processed,
+        seconds=seconds,
+        rows_per_second=processed / seconds if seconds else float("inf"),
+        peak_mib=peak_mib,
+    )
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def compare(results: dict[str, list[dict]], baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for size, stages in results.items():
+        previous = {item["stage"]: item for item in baseline.get(size, [])}
+        for item in stages:
+            before = previous.get(item["stage"])
+            if not before:
+                continue
+            ratio = item["rows_per_second"] / before["rows_per_second"]
+            if ratio < 1 - tolerance:
+                regressions.append(
+                    f"{item['stage']} @ {size}: {ratio:.0%} of baseline throughput"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic data.")
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated row counts (10k, 1m, ...).")
+    parser.add_argument("--stages", help="Comma-separated subset of stage names to run.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved baseline JSON.")
+    parser.add_argument("--save-baseline", type=Path, help="Write results as a new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    wanted = set(args.stages.split(",")) if args.stages else None
+
+    results: dict[str, list[dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="showsintown-bench-") as scratch:
+        for size_text in args.sizes.split(","):
+            rows = parse_size(size_text)
+            print(f"\n== {rows:,} listings ==")
+            print(f"{'stage':<30} {'rows':>10} {'seconds':>9} {'rows/s':>13} {'peak MiB':>9}")
+            size_results = []
+            for stage in build_stages(rows, Path(scratch)):
+                if wanted and stage.name not in wanted:
+                    continue
+                result = measure(stage, track_memory=not args.no_memory)
+                size_results.append(asdict(result))
+                peak = f"{result.peak_mib:9.1f}" if result.peak_mib is not None else f"{'-':>9}"
+                print(
+                    f"{result.stage:<30} {result.rows:>10,} {result.seconds:>9.3f} "
+                    f"{result.rows_per_second:>13,.0f} {peak}"
+                )
+            results[str(rows)] = size_results
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance
+        )
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,284 @@
 from __future__ import annotations
 
 import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
-from ..events.models import EventRecord
+from ..config import DEFAULT_TAB
+from ..events.batch import EventBatch
+from ..events.models import EventRecord, canonical_key
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; stay well below the limit.
+QUERY_BATCH_SIZE = 500
+# Bumped when the key format changes; older databases are re-keyed on open.
+KEY_VERSION = "2"
+
+EVENTS_TABLE = """
+CREATE TABLE IF NOT EXISTS events (
+    tab TEXT NOT NULL,
+    key TEXT NOT NULL,
+    event_date TEXT NOT NULL,
+    PRIMARY KEY (tab, key)
+) WITHOUT ROWID
+"""
+EVENTS_INDEX = "CREATE INDEX IF NOT EXISTS events_by_date ON events (event_date)"
+SCHEMA = f"""
+{EVENTS_TABLE};
+{EVENTS_INDEX};
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    cutoff: date
+    removed: int
+    remaining: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return max(0, self.bytes_before - self.bytes_after)
 
 
 class EventCache:
-    def __init__(self, path: Path) -> None:
-        self.path = path
-        self._data: dict[str, str] = {}
+    """SQLite-backed record of events that have already been written, per sheet tab.
+
+    ``path`` may point at the legacy JSON cache; the database then lives next
+    to it with a ``.sqlite3`` suffix and the JSON contents are imported once.
+    SQLite's own file locking and transactions keep concurrent runs safe.
+    """
+
+    def __init__(self, path: Path, retention_days: int | None = None) -> None:
+        self.retention_days = retention_days
+        if path.suffix == ".json":
+            self.legacy_path = path
+            self.path = path.with_suffix(".sqlite3")
+        else:
+            self.legacy_path = path.with_suffix(".json")
+            self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
         self.load()
 
     @staticmethod
     def _key(event: EventRecord) -> str:
-        return "|".join(
-            [
-                event.venue.casefold(),
-                event.event.casefold(),
-                event.date.isoformat(),
-            ]
-        )
+        return event.key
+
+    @staticmethod
+    def _canonical(key: str) -> str:
+        """Map a v1 ``venue|event|date`` key to ``canonical_key``; v2 keys pass through."""
+        if "|" not in key:
+            return key
+        parts = key.split("|")
+        if len(parts) < 3:
+            return key
+        return canonical_key(parts[0], "|".join(parts[1:-1]), parts[-1])
 
     def load(self) -> None:
-        if not self.path.exists():
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            self.path.write_text("{}", encoding="utf-8")
-        try:
-            self._data = json.loads(self.path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            self._data = {}
+        if self._conn is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+        self._migrate_tabs()
+        self._migrate_keys()
+        self._migrate_legacy_json()
+        if self.retention_days is not None:
+            self.compact(self.retention_days)
+
+    def _migrate_legacy_json(self) -> None:
+        if not self.legacy_path.exists():
+            return
+        with self._transaction() as conn:
+            done = conn.execute(
+                "SELECT 1 FROM meta WHERE name = 'legacy_json_migrated'"
+            ).fetchone()
+            if done:
+                return
+            try:
+                legacy = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring unreadable legacy cache %s", self.legacy_path)
+                legacy = {}
+            conn.executemany(
+                "INSERT OR REPLACE INTO events (tab, key, event_date) VALUES (?, ?, ?)",
+                ((DEFAULT_TAB, self._canonical(key), day) for key, day in legacy.items()),
+            )
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('legacy_json_migrated', ?)",
+                (str(self.legacy_path),),
+            )
+        logger.info(
+            "Migrated %d cached event(s) from %s to %s",
+            len(legacy),
+            self.legacy_path,
+            self.path,
+        )
+
+    def _migrate_tabs(self) -> None:
+        """Move a cache from before per-tab keys into ``DEFAULT_TAB``."""
+        with self._transaction() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+            if "tab" in columns:
+                return
+            conn.execute("DROP INDEX IF EXISTS events_by_date")
+            conn.execute("ALTER TABLE events RENAME TO events_untabbed")
+            conn.execute(EVENTS_TABLE)
+            conn.execute(EVENTS_INDEX)
+            moved = conn.execute(
+                "INSERT INTO events (tab, key, event_date) "
+                "SELECT ?, key, event_date FROM events_untabbed",
+                (DEFAULT_TAB,),
+            ).rowcount
+            conn.execute("DROP TABLE events_untabbed")
+        if moved:
+            logger.info("Moved %d cached event(s) to the %s tab", moved, DEFAULT_TAB)
+
+    def _migrate_keys(self) -> None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'key_version'").fetchone()
+            if row and row[0] == KEY_VERSION:
+                return
+            rows = conn.execute("SELECT tab, key, event_date FROM events").fetchall()
+            if rows:
+                conn.execute("DELETE FROM events")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO events (tab, key, event_date) VALUES (?, ?, ?)",
+                    ((tab, self._canonical(key), day) for tab, key, day in rows),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('key_version', ?)",
+                (KEY_VERSION,),
+            )
+        if rows:
+            logger.info("Re-keyed %d cached event(s) to key version %s", len(rows), KEY_VERSION)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes SQLite's write lock up front, so concurrent runs
+        # queue behind each other instead of failing mid-write.
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _file_size(self) -> int:
+        return sum(
+            candidate.stat().st_size
+            for candidate in (
+                self.path,
+                self.path.with_name(self.path.name + "-wal"),
+            )
+            if candidate.exists()
+        )
+
+    def compact(
+        self, retention_days: int, today: date | None = None, vacuum: bool = False
+    ) -> CompactionReport:
+        """Drop events dated more than ``retention_days`` before ``today``.
+
+        ``vacuum`` also rewrites the database file so the freed pages are
+        returned to the filesystem; it is slower, so only the standalone
+        compaction command asks for it.
+        """
+        cutoff = (today or date.today()) - timedelta(days=retention_days)
+        bytes_before = self._file_size()
+        with self._transaction() as conn:
+            removed = conn.execute(
+                "DELETE FROM events WHERE event_date < ?", (cutoff.isoformat(),)
+            ).rowcount
+        if vacuum:
+            with self._lock:
+                self._conn.execute("VACUUM")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        report = CompactionReport(
+            cutoff=cutoff,
+            removed=removed,
+            remaining=len(self),
+            bytes_before=bytes_before,
+            bytes_after=self._file_size(),
+        )
+        if removed:
+            logger.info(
+                "Evicted %d cached event(s) dated before %s; %d remain",
+                removed,
+                cutoff,
+                report.remaining,
+            )
+        return report
 
     def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(self._data, indent=2, sort_keys=True), encoding="utf-8")
-
-    def filter_new(self, events: Iterable[EventRecord]) -> list[EventRecord]:
-        new_events: list[EventRecord] = []
-        for event in events:
-            key = self._key(event)
-            if key not in self._data:
-                new_events.append(event)
-        return new_events
-
-    def record_events(self, events: Iterable[EventRecord]) -> None:
-        for event in events:
-            key = self._key(event)
-            self._data[key] = event.date.isoformat()
-        self.save()
+        """Writes are committed as they happen; kept for API compatibility."""
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def _existing_keys(self, keys: list[str], tab: str) -> set[str]:
+        found: set[str] = set()
+        with self._lock:
+            for offset in range(0, len(keys), QUERY_BATCH_SIZE):
+                chunk = keys[offset : offset + QUERY_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM events WHERE tab = ? AND key IN ({placeholders})",
+                    (tab, *chunk),
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def filter_new(
+        self, events: Iterable[EventRecord], tab: str = DEFAULT_TAB
+    ) -> list[EventRecord]:
+        keyed = [(self._key(event), event) for event in events]
+        existing = self._existing_keys(list({key for key, _ in keyed}), tab)
+        return [event for key, event in keyed if key not in existing]
+
+    def unseen_indices(self, batch: EventBatch, tab: str = DEFAULT_TAB) -> list[int]:
+        """Indices of the rows of ``batch`` whose key is not cached for ``tab`` yet."""
+        existing = self._existing_keys(list(set(batch.keys)), tab)
+        return [index for index, key in enumerate(batch.keys) if key not in existing]
+
+    def record_events(
+        self, events: Iterable[EventRecord] | EventBatch, tab: str = DEFAULT_TAB
+    ) -> None:
+        if isinstance(events, EventBatch):
+            days = {ordinal: date.fromordinal(ordinal).isoformat() for ordinal in set(events.ordinals)}
+            rows = [
+                (tab, key, days[ordinal]) for key, ordinal in zip(events.keys, events.ordinals)
+            ]
+        else:
+            rows = [(tab, self._key(event), event.date.isoformat()) for event in events]
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO events (tab, key, event_date) VALUES (?, ?, ?)", rows
+            )
 
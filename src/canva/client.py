@@ -21,12 +21,21 @@ client class that exposes a `publish(events_by_venue)` method.
 from collections import defaultdict
 from typing import Iterable
 
+from ..events.batch import EventBatch
 from ..events.models import EventRecord
 
 
-def group_events_by_venue(events: Iterable[EventRecord]) -> dict[str, list[EventRecord]]:
+def group_events_by_venue(
+    events: Iterable[EventRecord] | EventBatch,
+) -> dict[str, list[EventRecord]]:
+    # Grouping is one pass either way, so plain records are not converted;
+    # a batch groups on its interned venue column.
+    if isinstance(events, EventBatch):
+        pairs = zip(events.venues, events.to_records())
+    else:
+        pairs = ((event.venue, event) for event in events)
     grouped: dict[str, list[EventRecord]] = defaultdict(list)
-    for event in events:
-        grouped[event.venue].append(event)
+    for venue, event in pairs:
+        grouped[venue].append(event)
     return dict(grouped)
 
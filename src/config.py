@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 
@@ -20,6 +23,55 @@ def load_environment() -> None:
             load_dotenv(default_path)
 
 
+DEFAULT_TAB = "Master"
+
+
+@dataclass(frozen=True)
+class SourceConfig:
+    """One listing page to scrape, with its own venue fallbacks and sheet tab."""
+
+    url: str
+    target_venues: tuple[str, ...] = ()
+    tab: str = DEFAULT_TAB
+
+    @property
+    def site_url(self) -> str:
+        """Scheme and host of ``url``; venue pages and the API live there."""
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    @property
+    def name(self) -> str:
+        """Filesystem-friendly label derived from the URL path, e.g. ``los-angeles-ca``."""
+        path = urlsplit(self.url).path.strip("/")
+        return re.sub(r"[^a-z0-9]+", "-", path.lower()).strip("-") or "source"
+
+
+def _parse_sources(raw: str) -> tuple[SourceConfig, ...]:
+    try:
+        entries = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"SOURCES must be a JSON list: {exc}") from exc
+    if not isinstance(entries, list):
+        raise RuntimeError("SOURCES must be a JSON list of objects.")
+
+    sources = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("url"):
+            raise RuntimeError(f"Each SOURCES entry needs a 'url': {entry!r}")
+        venues = entry.get("target_venues") or ()
+        if isinstance(venues, str):
+            venues = venues.split(",")
+        sources.append(
+            SourceConfig(
+                url=entry["url"],
+                target_venues=tuple(venue.strip() for venue in venues if venue.strip()),
+                tab=entry.get("tab") or DEFAULT_TAB,
+            )
+        )
+    return tuple(sources)
+
+
 @dataclass(frozen=True)
 class Settings:
     source_url: str
@@ -29,6 +81,33 @@ class Settings:
     headless: bool = True
     timeout: int = 20
     target_venues: tuple[str, ...] = ()
+    scroll_timeout: float = 30.0
+    max_pages: int = 200
+    page_workers: int = 4
+    venue_workers: int = 8
+    venue_host_limit: int = 4
+    http_max_retries: int = 3
+    http_rate_limit: float = 5.0
+    http_cache_dir: Path | None = None
+    http_cache_max_mb: int = 200
+    http_cache_max_age_days: int = 14
+    cache_retention_days: int | None = 30
+    sheet_index_file: Path | None = None
+    chromedriver_path: str | None = None
+    driver_path_cache: Path | None = None
+    driver_offline: bool = False
+    block_resources: bool = True
+    sources: tuple[SourceConfig, ...] = ()
+    source_workers: int = 4
+    browser_pool_size: int = 2
+    metrics_file: Path | None = None
+    prometheus_textfile: Path | None = None
+
+    def resolved_sources(self) -> tuple[SourceConfig, ...]:
+        """``SOURCES`` if configured, else the single ``SOURCE_URL`` source."""
+        if self.sources:
+            return self.sources
+        return (SourceConfig(url=self.source_url, target_venues=self.target_venues),)
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -40,11 +119,33 @@ class Settings:
         )
         spreadsheet_id = os.getenv("SPREADSHEET_ID")
         service_account_file = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")
-        cache_file = os.getenv("CACHE_FILE", "data/events_cache.json")
+        cache_file = os.getenv("CACHE_FILE", "data/events_cache.sqlite3")
         headless = os.getenv("HEADLESS", "true").lower() in {"1", "true", "yes"}
         target_venues_raw = os.getenv(
             "TARGET_VENUES", "Troubadour,Exchange LA,SoFi Stadium"
         )
+        scroll_timeout = float(os.getenv("SCROLL_TIMEOUT", "30"))
+        max_pages = int(os.getenv("MAX_PAGES", "200"))
+        page_workers = int(os.getenv("PAGE_WORKERS", "4"))
+        venue_workers = int(os.getenv("VENUE_WORKERS", "8"))
+        venue_host_limit = int(os.getenv("VENUE_HOST_LIMIT", "4"))
+        http_max_retries = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+        http_rate_limit = float(os.getenv("HTTP_RATE_LIMIT", "5"))
+        http_cache_dir = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+        http_cache_max_mb = int(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+        http_cache_max_age_days = int(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "14"))
+        cache_retention_raw = os.getenv("CACHE_RETENTION_DAYS", "30")
+        sheet_index_file = os.getenv("SHEET_INDEX_FILE", "data/sheet_index.json")
+        chromedriver_path = os.getenv("CHROMEDRIVER_PATH") or None
+        driver_path_cache = os.getenv("DRIVER_PATH_CACHE", "data/chromedriver_path")
+        driver_offline = os.getenv("DRIVER_OFFLINE", "false").lower() in {"1", "true", "yes"}
+        block_resources = os.getenv("BLOCK_RESOURCES", "true").lower() in {"1", "true", "yes"}
+        sources_raw = os.getenv("SOURCES", "").strip()
+        sources = _parse_sources(sources_raw) if sources_raw else ()
+        source_workers = int(os.getenv("SOURCE_WORKERS", "4"))
+        browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        metrics_file = os.getenv("METRICS_FILE", "data/metrics/last_run.json")
+        prometheus_textfile = os.getenv("PROMETHEUS_TEXTFILE", "data/metrics/showsintown.prom")
         target_venues = tuple(
             venue.strip()
             for venue in target_venues_raw.split(",")
@@ -71,5 +172,34 @@ class Settings:
             cache_file=Path(cache_file).expanduser().resolve(),
             headless=headless,
             target_venues=target_venues,
+            scroll_timeout=scroll_timeout,
+            max_pages=max_pages,
+            page_workers=page_workers,
+            venue_workers=venue_workers,
+            venue_host_limit=venue_host_limit,
+            http_max_retries=http_max_retries,
+            http_rate_limit=http_rate_limit,
+            http_cache_dir=(
+                Path(http_cache_dir).expanduser().resolve() if http_cache_dir else None
+            ),
+            http_cache_max_mb=http_cache_max_mb,
+            http_cache_max_age_days=http_cache_max_age_days,
+            cache_retention_days=int(cache_retention_raw) if cache_retention_raw else None,
+            sheet_index_file=(
+                Path(sheet_index_file).expanduser().resolve() if sheet_index_file else None
+            ),
+            chromedriver_path=chromedriver_path,
+            driver_path_cache=(
+                Path(driver_path_cache).expanduser().resolve() if driver_path_cache else None
+            ),
+            driver_offline=driver_offline,
+            block_resources=block_resources,
+            sources=sources,
+            source_workers=source_workers,
+            browser_pool_size=browser_pool_size,
+            metrics_file=Path(metrics_file).expanduser().resolve() if metrics_file else None,
+            prometheus_textfile=(
+                Path(prometheus_textfile).expanduser().resolve() if prometheus_textfile else None
+            ),
         )
 
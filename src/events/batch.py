@@ -0,0 +1,130 @@
+"""Columnar view of many events, for stages that operate on whole result sets."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import date
+from itertools import compress
+from operator import attrgetter, not_
+from typing import Iterable, Sequence
+
+from .models import EventRecord
+
+
+class EventBatch:
+    """Events stored as parallel columns.
+
+    ``venues``, ``events`` and ``artists`` hold interned strings (venues and
+    artists repeat heavily), ``ordinals`` holds ``date.toordinal()`` values in
+    an ``array('i')`` and ``keys`` the records' ``canonical_key``. The pipeline
+    builds one batch per source right after scraping and keeps it through
+    validation, dedupe, cache filtering and the Sheets write; ``to_records``
+    (which reuses the stored keys instead of hashing again) is for callers that
+    need records.
+    """
+
+    __slots__ = ("venues", "events", "artists", "ordinals", "keys")
+
+    def __init__(
+        self,
+        venues: list[str] | None = None,
+        events: list[str] | None = None,
+        artists: list[str] | None = None,
+        ordinals: array | None = None,
+        keys: list[str] | None = None,
+    ) -> None:
+        self.venues = venues if venues is not None else []
+        self.events = events if events is not None else []
+        self.artists = artists if artists is not None else []
+        self.ordinals = ordinals if ordinals is not None else array("i")
+        self.keys = keys if keys is not None else []
+
+    @classmethod
+    def from_records(cls, records: Iterable[EventRecord]) -> "EventBatch":
+        records = records if isinstance(records, list) else list(records)
+        intern = sys.intern
+        return cls(
+            venues=list(map(intern, map(attrgetter("venue"), records))),
+            events=list(map(intern, map(attrgetter("event"), records))),
+            artists=list(map(intern, map(attrgetter("artist"), records))),
+            ordinals=array("i", map(date.toordinal, map(attrgetter("date"), records))),
+            keys=list(map(attrgetter("key"), records)),
+        )
+
+    @classmethod
+    def coerce(cls, events: "Iterable[EventRecord] | EventBatch") -> "EventBatch":
+        return events if isinstance(events, EventBatch) else cls.from_records(events)
+
+    @classmethod
+    def concat(cls, batches: Iterable["EventBatch"]) -> "EventBatch":
+        merged = cls()
+        for batch in batches:
+            merged.venues.extend(batch.venues)
+            merged.events.extend(batch.events)
+            merged.artists.extend(batch.artists)
+            merged.ordinals.extend(batch.ordinals)
+            merged.keys.extend(batch.keys)
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def to_records(self) -> list[EventRecord]:
+        fromordinal = date.fromordinal
+        return [
+            EventRecord(venue=venue, event=event, date=fromordinal(ordinal), artist=artist, key=key)
+            for venue, event, ordinal, artist, key in zip(
+                self.venues, self.events, self.ordinals, self.artists, self.keys
+            )
+        ]
+
+    def sheet_rows(self) -> list[list[str]]:
+        """``EventRecord.to_sheet_row`` for every row, without building records."""
+        days = {ordinal: date.fromordinal(ordinal).strftime("%Y-%m-%d") for ordinal in set(self.ordinals)}
+        return [
+            [venue, event, days[ordinal], artist]
+            for venue, event, ordinal, artist in zip(
+                self.venues, self.events, self.ordinals, self.artists
+            )
+        ]
+
+    def take(self, indices: Sequence[int]) -> "EventBatch":
+        return EventBatch(
+            venues=[self.venues[i] for i in indices],
+            events=[self.events[i] for i in indices],
+            artists=[self.artists[i] for i in indices],
+            ordinals=array("i", [self.ordinals[i] for i in indices]),
+            keys=[self.keys[i] for i in indices],
+        )
+
+    def first_occurrences(self) -> list[int]:
+        """Indices of the first row for each key, in order."""
+        # Filling the dict back to front leaves each key at its lowest index.
+        last = len(self.keys) - 1
+        first = dict(zip(reversed(self.keys), range(last, -1, -1)))
+        if len(first) == len(self.keys):
+            return list(range(len(self.keys)))
+        return sorted(first.values())
+
+    @staticmethod
+    def selected(mask: Sequence[bool]) -> list[int]:
+        """Indices where ``mask`` is true."""
+        return list(compress(range(len(mask)), mask))
+
+    @staticmethod
+    def rejected(mask: Sequence[bool]) -> list[int]:
+        """Indices where ``mask`` is false."""
+        return list(compress(range(len(mask)), map(not_, mask)))
+
+    def in_window(self, start: date, end: date) -> list[bool]:
+        low, high = start.toordinal(), end.toordinal()
+        return [low <= ordinal <= high for ordinal in self.ordinals]
+
+    def has_blank(self, column: str) -> bool:
+        values = getattr(self, column)
+        return "" in values or any(map(str.isspace, values))
+
+    def blank(self, column: str) -> list[bool]:
+        """True where ``column`` is empty or whitespace-only."""
+        return [not value or value.isspace() for value in getattr(self, column)]
@@ -1,12 +1,98 @@
 from __future__ import annotations
 
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable
+
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from ..metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+DRIVER_PATH_CACHE = Path("data/chromedriver_path")
+
+# Requests matching these patterns are dropped via CDP before they leave Chrome.
+BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+    "*.mp3",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*scorecardresearch.com*",
+    "*criteo.com*",
+    "*taboola.com*",
+]
+
 
-def create_driver(headless: bool = True, implicit_wait: float = 3.0) -> webdriver.Chrome:
+def resolve_driver_path(
+    explicit: str | None = None,
+    cache_file: Path | None = DRIVER_PATH_CACHE,
+    offline: bool = False,
+) -> str:
+    """Find a chromedriver binary without hitting the network when possible.
+
+    Order: an explicit path, the path cached by a previous run, then (offline)
+    ``chromedriver`` on ``PATH`` or (online) ``webdriver-manager``, whose result
+    is cached for next time. ``cache_file=None`` disables the cache.
+    """
+    if explicit:
+        return explicit
+
+    if cache_file is not None and cache_file.is_file():
+        cached = cache_file.read_text(encoding="utf-8").strip()
+        if cached and os.access(cached, os.X_OK):
+            return cached
+
+    if offline:
+        on_path = shutil.which("chromedriver")
+        if not on_path:
+            raise RuntimeError(
+                "Offline driver mode: no cached chromedriver and none on PATH. "
+                "Set CHROMEDRIVER_PATH or run once online."
+            )
+        return on_path
+
+    driver_path = ChromeDriverManager().install()
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(driver_path, encoding="utf-8")
+        logger.info("Cached chromedriver path %s", driver_path)
+    return driver_path
+
+
+def create_driver(
+    headless: bool = True,
+    implicit_wait: float = 3.0,
+    driver_path: str | None = None,
+    offline: bool = False,
+    block_resources: bool = True,
+    driver_path_cache: Path | None = DRIVER_PATH_CACHE,
+) -> webdriver.Chrome:
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -14,10 +100,88 @@ def create_driver(headless: bool = True, implicit_wait: float = 3.0) -> webdrive
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
+    # Don't wait for images/stylesheets; the rows are in the DOM at DOMContentLoaded.
+    chrome_options.page_load_strategy = "eager"
+    if block_resources:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
 
-    driver_path = ChromeDriverManager().install()
-    service = Service(driver_path)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    resolved = resolve_driver_path(driver_path, driver_path_cache, offline=offline)
+    try:
+        driver = webdriver.Chrome(service=Service(resolved), options=chrome_options)
+    except SessionNotCreatedException:
+        # Usually Chrome updated itself past the cached driver; resolve afresh once.
+        if driver_path or driver_path_cache is None or not driver_path_cache.is_file():
+            raise
+        logger.warning("Cached chromedriver %s no longer matches Chrome; re-resolving", resolved)
+        driver_path_cache.unlink(missing_ok=True)
+        resolved = resolve_driver_path(None, driver_path_cache, offline=offline)
+        driver = webdriver.Chrome(service=Service(resolved), options=chrome_options)
     driver.implicitly_wait(implicit_wait)
+    if block_resources:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     return driver
 
+
+class BrowserPool:
+    """Hands out at most ``size`` Chrome sessions, started lazily and reused.
+
+    ``acquire`` blocks while every session is checked out or starting;
+    ``release`` returns a session for the next caller and ``close`` quits them
+    all. Chrome starts outside the lock, and a failed start frees its slot and
+    wakes a waiter, which then retries the start itself.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], webdriver.Chrome],
+        size: int = 2,
+        metrics: RunMetrics | None = None,
+    ) -> None:
+        self._factory = factory
+        self._metrics = metrics or RunMetrics()
+        self._size = max(1, size)
+        self._idle: list[webdriver.Chrome] = []
+        self._created: list[webdriver.Chrome] = []
+        # Sessions started or starting; a slot is reserved before Chrome starts.
+        self._started = 0
+        self._available = threading.Condition()
+
+    def acquire(self) -> webdriver.Chrome:
+        with self._available:
+            while not self._idle and self._started >= self._size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            with self._metrics.stage("chrome_startup"):
+                driver = self._factory()
+        except Exception:
+            with self._available:
+                self._started -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._created.append(driver)
+        return driver
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def close(self) -> None:
+        with self._available:
+            for driver in self._created:
+                try:
+                    driver.quit()
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed to quit browser: %s", exc)
+            self._created.clear()
+            self._idle.clear()
+            self._started = 0
+            self._available.notify_all()
@@ -0,0 +1,95 @@
+"""Offline listing parser for raw or saved listing-page HTML.
+
+Reads the same rows as the browser fallback (see ``selectors.py``) with
+BeautifulSoup, so saved ``page_source`` dumps can be parsed without Chrome.
+Many pages are spread across a process pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Sequence
+
+from bs4 import BeautifulSoup
+
+from .models import EventRecord
+from .parsers import records_from_rows
+from .selectors import (
+    EVENT_DATE_MONTH_DAY,
+    EVENT_DATE_TIME,
+    EVENT_LOCATION,
+    EVENT_ROW,
+    EVENT_TITLE,
+)
+
+logger = logging.getLogger(__name__)
+
+ROW_FIELDS = {
+    "title": EVENT_TITLE,
+    "location": EVENT_LOCATION,
+    "month_day": EVENT_DATE_MONTH_DAY,
+    "time": EVENT_DATE_TIME,
+}
+# Below this many pages the pool's startup cost outweighs the parallelism.
+POOL_THRESHOLD = 4
+
+
+def parse_listing_rows(html: str) -> list[dict[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
+    rows: list[dict[str, str]] = []
+    for node in soup.select(EVENT_ROW):
+        row = {"href": node.get("href") or ""}
+        for name, selector in ROW_FIELDS.items():
+            match = node.select_one(selector)
+            row[name] = match.get_text(" ", strip=True) if match else ""
+        rows.append(row)
+    return rows
+
+
+def parse_listing_pages(
+    pages: Sequence[str], workers: int | None = None
+) -> list[list[dict[str, str]]]:
+    """Parse each page's rows, in input order."""
+    if len(pages) < POOL_THRESHOLD or workers == 1:
+        return [parse_listing_rows(page) for page in pages]
+
+    max_workers = min(workers or os.cpu_count() or 1, len(pages))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse_listing_rows, pages, chunksize=1))
+
+
+def records_from_html(
+    pages: Sequence[str], start: date, end: date, workers: int | None = None
+) -> list[EventRecord]:
+    rows = [row for page_rows in parse_listing_pages(pages, workers) for row in page_rows]
+    return records_from_rows(rows, start, end)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parse saved listing HTML without a browser.")
+    parser.add_argument("paths", nargs="+", type=Path, help="Saved listing page(s).")
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, required=True)
+    parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count).")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    pages = [path.read_text(encoding="utf-8") for path in args.paths]
+    records = records_from_html(pages, args.start, args.end, workers=args.workers)
+    for record in records:
+        print("\t".join(record.to_sheet_row()))
+    logger.info("Parsed %d event(s) from %d page(s)", len(records), len(pages))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import html
+import unicodedata
+from dataclasses import dataclass, field
 from datetime import date
+from typing import Iterable
+
+
+def _canonical_text(value: str) -> str:
+    text = unicodedata.normalize("NFKC", html.unescape(value))
+    return " ".join(text.casefold().split())
+
+
+def canonical_key(venue: str, event: str, day: str) -> str:
+    """Identity of an event across scrapes, the cache and the sheet.
+
+    Venue and title are entity-unescaped, NFKC-normalized, casefolded and
+    whitespace-collapsed; ``day`` is the ISO date. The result is a 24-char
+    BLAKE2b hex digest.
+    """
+    raw = "\x1f".join((_canonical_text(venue), _canonical_text(event), day.strip()))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
 
 
 @dataclass(slots=True)
@@ -10,6 +30,13 @@ class EventRecord:
     event: str
     date: date
     artist: str
+    # Computed from the other fields; pass it only when it is already known
+    # (``EventBatch.to_records``) to skip hashing again.
+    key: str = field(default="", repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.key:
+            self.key = canonical_key(self.venue, self.event, self.date.isoformat())
 
     def to_sheet_row(self) -> list[str]:
         return [
@@ -19,3 +46,13 @@ class EventRecord:
             self.artist,
         ]
 
+
+def unique_events(events: Iterable[EventRecord]) -> list[EventRecord]:
+    """Drop repeats of an already-seen ``key``, keeping the first occurrence."""
+    seen: set[str] = set()
+    unique = []
+    for event in events:
+        if event.key not in seen:
+            seen.add(event.key)
+            unique.append(event)
+    return unique
@@ -1,13 +1,61 @@
 from __future__ import annotations
 
 import logging
+import re
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional
 
 import pendulum
 
+from .models import EventRecord
+
 logger = logging.getLogger(__name__)
 
+DATE_CACHE_SIZE = 8192
+HREF_DATE_PATTERN = re.compile(r"-(\d{2})-(\d{2})-(\d{4})(?:-|$)")
+MONTH_DAY_PATTERN = re.compile(r"^([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{1,2})$")
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> date:
+    """Parse the calendar date out of ``value``.
+
+    ISO layouts (``YYYY-MM-DD`` optionally followed by ``T``/space and a time)
+    are sliced directly; anything else goes through ``pendulum.parse``. Raises
+    ``ValueError`` (pendulum's ``ParserError`` included) when nothing matches.
+    """
+    text = value.strip()
+    if len(text) >= 10 and text[4] == "-" and text[7] == "-" and (
+        len(text) == 10 or text[10] in "T "
+    ):
+        try:
+            return date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+        except ValueError:
+            pass
+    return pendulum.parse(text, strict=False).date()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_month_day_year(month_day: str, year: str) -> date | None:
+    match = MONTH_DAY_PATTERN.match(month_day)
+    if not match or not year.isdigit():
+        return None
+    month = MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
+    try:
+        return date(int(year), month, int(match.group(2)))
+    except ValueError:
+        return None
+
 
 def parse_event_date(
     month_day: Optional[str],
@@ -17,6 +65,11 @@ def parse_event_date(
     if not month_day:
         return None
 
+    if year:
+        fast = _parse_month_day_year(month_day.strip(), year.strip())
+        if fast is not None:
+            return fast
+
     pieces = [month_day.strip()]
     if year:
         pieces.append(year.strip())
@@ -25,9 +78,8 @@ def parse_event_date(
 
     candidate = " ".join(pieces)
     try:
-        parsed = pendulum.parse(candidate, strict=False)
-        return parsed.date()
-    except (pendulum.parsing.exceptions.ParserError, TypeError, ValueError) as exc:
+        return parse_date(candidate)
+    except (TypeError, ValueError) as exc:
         logger.warning("Could not parse date components %r: %s", candidate, exc)
         return None
 
@@ -35,3 +87,45 @@ def parse_event_date(
 def scrub(text: str | None) -> str:
     return text.strip() if text else ""
 
+
+def extract_year(href: str | None) -> str | None:
+    match = HREF_DATE_PATTERN.search(href or "")
+    if match:
+        return match.group(3)
+    return None
+
+
+def records_from_rows(
+    rows: Iterable[Mapping[str, str]], start: date, end: date
+) -> list[EventRecord]:
+    """Build records from listing rows scraped out of the DOM.
+
+    Each row carries ``title``, ``location``, ``month_day``, ``time`` and
+    ``href`` strings, as produced by the in-page extraction script.
+    """
+    records: list[EventRecord] = []
+    for row in rows:
+        title = scrub(row.get("title"))
+        if not title:
+            continue
+
+        location = scrub(row.get("location"))
+        venue = location.split(",")[0] if location else ""
+        event_date = parse_event_date(
+            scrub(row.get("month_day")),
+            scrub(row.get("time")),
+            extract_year(row.get("href")),
+        )
+        if not event_date:
+            continue
+
+        if start <= event_date <= end:
+            records.append(
+                EventRecord(
+                    venue=venue,
+                    event=title,
+                    date=event_date,
+                    artist=title,
+                )
+            )
+    return records
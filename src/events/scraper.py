@@ -4,20 +4,26 @@ import copy
 import html
 import json
 import logging
+import math
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Iterable
+from typing import Callable, Iterable
+from urllib.parse import urljoin
 
-import pendulum
 import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from .models import EventRecord
-from .parsers import parse_event_date, scrub
+from ..metrics import RunMetrics
+from ..transport.client import HttpTransport
+from ..transport.recording import Recorder
+from .html_parser import records_from_html
+from .models import EventRecord, unique_events
+from .parsers import parse_date, records_from_rows
 from .selectors import (
     EVENT_DATE_MONTH_DAY,
     EVENT_DATE_TIME,
@@ -29,143 +35,431 @@ from .selectors import (
 logger = logging.getLogger(__name__)
 
 ES_REQUEST_PATTERN = re.compile(r"var\s+esRequest\s*=\s*(\{.*?\});", re.DOTALL)
-API_ENDPOINT = "https://www.boxofficeticketsales.com/es/v2"
+API_PATH = "/es/v2"
+ES_REQUEST_ARTIFACT = "es_request.json"
+LISTING_DOM_ARTIFACT = "listing_dom.html"
+# Search state pushed into the /es/v2 payload so the server only returns the
+# target week's concerts. Listings are still re-checked client-side.
+EVENT_TYPE = "Concerts"
+TYPE_FILTER_FIELD = "type"
+DATE_FILTER_FIELD = "datetime_local"
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Scrolls until the row count stops changing. Activity is tracked with a
+# MutationObserver (new rows) and a PerformanceObserver (network requests), and
+# the callback fires once the page has been quiet for ``quietMs`` or the
+# ``deadlineMs`` budget is spent.
+SCROLL_UNTIL_STABLE_SCRIPT = """
+const [selector, quietMs, deadlineMs, done] = arguments;
+const countRows = () => document.querySelectorAll(selector).length;
+const scrollDown = () => window.scrollTo(0, document.body.scrollHeight);
+const started = Date.now();
+let lastActivity = started;
+let lastCount = countRows();
+
+const mutations = new MutationObserver(() => {
+  const count = countRows();
+  if (count !== lastCount) {
+    lastCount = count;
+    lastActivity = Date.now();
+    scrollDown();
+  }
+});
+mutations.observe(document.body, {childList: true, subtree: true});
+
+let network = null;
+if (window.PerformanceObserver) {
+  network = new PerformanceObserver(() => { lastActivity = Date.now(); });
+  try { network.observe({type: "resource", buffered: false}); } catch (e) { network = null; }
+}
+
+scrollDown();
+const timer = setInterval(() => {
+  const now = Date.now();
+  const timedOut = now - started >= deadlineMs;
+  if (timedOut || now - lastActivity >= quietMs) {
+    clearInterval(timer);
+    mutations.disconnect();
+    if (network) { network.disconnect(); }
+    done({count: countRows(), timedOut: timedOut});
+  } else {
+    scrollDown();
+  }
+}, 250);
+"""
+
+# Reads every listing row in a single round trip instead of one WebDriver call
+# per field; returns plain objects keyed like the Python-side row dicts.
+EXTRACT_ROWS_SCRIPT = """
+const [rowSelector, fields] = arguments;
+const text = (node, selector) => {
+  const match = node.querySelector(selector);
+  return match ? (match.innerText || match.textContent || "").trim() : "";
+};
+return Array.from(document.querySelectorAll(rowSelector), (node) => {
+  const row = {href: node.getAttribute("href") || ""};
+  for (const [name, selector] of Object.entries(fields)) {
+    row[name] = text(node, selector);
+  }
+  return row;
+});
+"""
+
+
+# API endpoints whose date filter has come back with only in-window concerts
+# during this process; an empty filtered search against them is taken as an
+# empty week instead of triggering the unfiltered fallback.
+_trusted_filters: set[str] = set()
+
+
+def _matches_filter(listings: list[dict], start: date, end: date) -> bool:
+    """Whether ``listings`` are all concerts dated ``start..end``, i.e. the filter applied."""
+    for listing in listings:
+        when = listing.get("datetime_local")
+        if (listing.get("type") or "").lower() != "concerts" or not when:
+            return False
+        try:
+            if not start <= parse_date(when) <= end:
+                return False
+        except ValueError:
+            return False
+    return bool(listings)
+
+
+def _reports_listings(es_request: dict) -> bool:
+    """Whether the listing page's embedded ``esRequest`` says there are listings."""
+    data = es_request.get("data") or {}
+    return bool(data.get("data") or data.get("recordsFiltered") or data.get("recordsTotal"))
 
 
 class BoxOfficeTicketSalesScraper:
-    def __init__(self, driver: WebDriver, source_url: str, timeout: int = 20) -> None:
-        self.driver = driver
+    def __init__(
+        self,
+        source_url: str,
+        timeout: int = 20,
+        driver_factory: Callable[[], WebDriver] | None = None,
+        session: HttpTransport | None = None,
+        driver_release: Callable[[WebDriver], None] | None = None,
+        scroll_deadline: float = 30.0,
+        scroll_quiet: float = 2.0,
+        max_pages: int = 200,
+        page_workers: int = 4,
+        max_per_page: int = 250,
+        recorder: Recorder | None = None,
+        artifact_prefix: str = "",
+        metrics: RunMetrics | None = None,
+    ) -> None:
         self.source_url = source_url
+        self.api_endpoint = urljoin(source_url, API_PATH)
+        self.recorder = recorder
+        self.artifact_prefix = artifact_prefix
+        self.metrics = metrics or RunMetrics()
         self.timeout = timeout
-
-    def _load_all_events(self) -> None:
-        max_rounds = 15
-        unchanged_rounds = 0
-        previous_count = 0
-
-        while unchanged_rounds < max_rounds:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
-            current_count = len(self.driver.find_elements(By.CSS_SELECTOR, EVENT_ROW))
-            if current_count == previous_count:
-                unchanged_rounds += 1
+        self.max_pages = max_pages
+        self.page_workers = max(1, page_workers)
+        self.max_per_page = max_per_page
+        self.scroll_deadline = scroll_deadline
+        self.scroll_quiet = scroll_quiet
+        self._driver_factory = driver_factory
+        self._driver_release = driver_release
+        self._driver: WebDriver | None = None
+        self._session = session
+
+    @property
+    def driver(self) -> WebDriver:
+        """Start the browser on first use; the HTTP path never touches it."""
+        if self._driver is None:
+            if self._driver_factory is None:
+                raise RuntimeError("No WebDriver factory configured for browser fallback.")
+            logger.info("Starting browser for DOM fallback")
+            self._driver = self._driver_factory()
+        return self._driver
+
+    @property
+    def session(self) -> HttpTransport:
+        if self._session is None:
+            self._session = HttpTransport(timeout=self.timeout)
+        return self._session
+
+    def close(self) -> None:
+        """Quit the browser, or hand it back via ``driver_release`` if pooled."""
+        if self._driver is not None:
+            if self._driver_release is not None:
+                self._driver_release(self._driver)
             else:
-                previous_count = current_count
-                unchanged_rounds = 0
+                self._driver.quit()
+            self._driver = None
 
-    def _iter_event_elements(self) -> Iterable:
-        return self.driver.find_elements(By.CSS_SELECTOR, EVENT_ROW)
+    def _load_all_events(self) -> None:
+        started = time.monotonic()
+        self.driver.set_script_timeout(self.scroll_deadline + 5)
+        with self.metrics.stage("scroll"):
+            outcome = self.driver.execute_async_script(
+                SCROLL_UNTIL_STABLE_SCRIPT,
+                EVENT_ROW,
+                int(self.scroll_quiet * 1000),
+                int(self.scroll_deadline * 1000),
+            ) or {}
+        elapsed = time.monotonic() - started
+        if outcome.get("timedOut"):
+            logger.warning(
+                "Scroll deadline of %.0fs reached with %s row(s) loaded",
+                self.scroll_deadline,
+                outcome.get("count"),
+            )
+        else:
+            logger.info(
+                "Loaded %s row(s) after %.1fs of scrolling", outcome.get("count"), elapsed
+            )
 
     def load_page(self) -> None:
         logger.info("Navigating to %s", self.source_url)
-        self.driver.get(self.source_url)
-        WebDriverWait(self.driver, self.timeout).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, EVENT_ROW))
-        )
-        self._load_all_events()
+        driver = self.driver
+        with self.metrics.stage("browser_page_load"):
+            driver.get(self.source_url)
+            WebDriverWait(driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, EVENT_ROW))
+            )
+
+    def _artifact(self, name: str) -> str:
+        return f"{self.artifact_prefix}{name}"
+
+    def fetch_listing_page(self) -> str:
+        logger.info("Fetching %s over HTTP", self.source_url)
+        with self.metrics.stage("listing_page"):
+            response = self.session.get(
+                self.source_url, headers=DEFAULT_HEADERS, timeout=self.timeout
+            )
+        response.raise_for_status()
+        return response.text
 
     def collect_week_events(self, start: date, end: date) -> list[EventRecord]:
-        self.load_page()
         try:
-            es_request = self._extract_es_request()
-            listings = self._fetch_listings(es_request)
-            records = self._build_records_from_listings(listings, start, end)
-            logger.info(
-                "Collected %d event(s) for the target week via API", len(records)
+            es_request = self._extract_es_request(self.fetch_listing_page())
+            return self._collect_from_api(es_request, start, end)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Browserless fetch failed, falling back to browser session: %s", exc
             )
-            return records
+            self.metrics.increment("fallback_browser")
+
+        if self._driver_factory is None and self.recorder is not None:
+            saved = self.recorder.load_artifact(self._artifact(LISTING_DOM_ARTIFACT))
+            if saved is not None:
+                self.metrics.increment("fallback_recorded_dom")
+                records = records_from_html([saved], start, end)
+                logger.info("Collected %d event(s) from recorded DOM", len(records))
+                return records
+
+        self.load_page()
+        try:
+            es_request = self._extract_es_request(self.driver.page_source)
+            return self._collect_from_api(es_request, start, end)
         except Exception as exc:  # noqa: BLE001
             logger.exception("API pagination failed, falling back to DOM parsing: %s", exc)
+            self.metrics.increment("fallback_dom")
             return self._collect_from_dom(start, end)
 
-    @staticmethod
-    def _safe_text(node, selector: str) -> str:
-        try:
-            return scrub(node.find_element(By.CSS_SELECTOR, selector).text)
-        except Exception:
-            return ""
+    def _collect_from_api(
+        self, es_request: dict, start: date, end: date
+    ) -> list[EventRecord]:
+        if self.recorder is not None:
+            self.recorder.save_artifact(
+                self._artifact(ES_REQUEST_ARTIFACT), json.dumps(es_request, indent=2)
+            )
+        with self.metrics.stage("api_pages"):
+            listings = self._fetch_listings(es_request, start, end)
+        with self.metrics.stage("build_records"):
+            records = self._build_records_from_listings(listings, start, end)
+        logger.info("Collected %d event(s) for the target week via API", len(records))
+        return records
 
     @staticmethod
-    def _extract_year(node) -> str | None:
-        href = node.get_attribute("href") or ""
-        match = re.search(r"-(\d{2})-(\d{2})-(\d{4})(?:-|$)", href)
-        if match:
-            return match.group(3)
-        return None
-
-    def _extract_es_request(self) -> dict:
-        html_source = self.driver.page_source
+    def _extract_es_request(html_source: str) -> dict:
         match = ES_REQUEST_PATTERN.search(html_source)
         if not match:
             raise RuntimeError("esRequest block not found in page source.")
         return json.loads(match.group(1))
 
-    def _fetch_listings(self, es_request: dict) -> list[dict]:
+    def _fetch_page(self, base_payload: dict, page: int, per_page: int) -> dict:
+        payload = {
+            **base_payload,
+            "page": page,
+            "start": (page - 1) * per_page,
+            "perPage": per_page,
+            "draw": base_payload["draw"] + page - 1,
+        }
+        response = self.session.post(self.api_endpoint, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_first_page(self, base_payload: dict, per_page: int) -> tuple[dict, int]:
+        """Fetch page 1 asking for the largest page size the endpoint accepts.
+
+        The endpoint may reject or silently clamp ``perPage``; the size of the
+        returned page tells us which value it actually honoured.
+        """
+        requested = max(per_page, self.max_per_page)
+        if requested > per_page:
+            try:
+                body = self._fetch_page(base_payload, 1, requested)
+            except (requests.RequestException, ValueError) as exc:
+                logger.info(
+                    "perPage=%d rejected (%s); using the default of %d",
+                    requested,
+                    exc,
+                    per_page,
+                )
+            else:
+                received = len(body.get("data") or [])
+                total = body.get("recordsFiltered") or 0
+                if received and total > received:
+                    return body, received
+                return body, requested
+        return self._fetch_page(base_payload, 1, per_page), per_page
+
+    @staticmethod
+    def _filtered_payload(base_payload: dict, start: date, end: date) -> dict:
+        """Copy of ``base_payload`` restricted to concerts between ``start`` and ``end``."""
+        static = dict(base_payload["static"])
+        static[DATE_FILTER_FIELD] = {
+            "gte": f"{start.isoformat()}T00:00:00",
+            "lte": f"{end.isoformat()}T23:59:59",
+        }
+        selected = dict(base_payload["selected"])
+        selected[TYPE_FILTER_FIELD] = [EVENT_TYPE]
+        return {**base_payload, "static": static, "selected": selected}
+
+    def _fetch_listings(
+        self, es_request: dict, start: date | None = None, end: date | None = None
+    ) -> list[dict]:
+        """Page through /es/v2, filtered server-side to ``start..end`` when given.
+
+        The filter fields are inferred, not documented. If the endpoint rejects
+        the filtered search (4xx), every listing is fetched instead and left to
+        ``_build_records_from_listings`` to filter. An empty filtered result
+        while the page's own ``esRequest`` reports listings is only taken at
+        face value once the filter has been seen working in this process;
+        until then one unfiltered page is probed and the full unfiltered crawl
+        only runs if that page holds concerts in the window.
+        """
         per_page = es_request.get("perPage") or 50
         if per_page <= 0:
             per_page = 50
 
-        base_payload = {
+        search = copy.deepcopy(es_request.get("search", {}))
+        unfiltered = {
             "draw": (es_request.get("draw") or 0) + 1,
             "page": 1,
             "start": 0,
             "perPage": per_page,
             "view": copy.deepcopy(es_request.get("view", {})),
-            "static": copy.deepcopy(es_request.get("search", {}).get("static", {})),
-            "preset": copy.deepcopy(es_request.get("search", {}).get("preset", {})),
-            "selected": copy.deepcopy(es_request.get("search", {}).get("selected", {})),
+            "static": search.get("static", {}),
+            "preset": search.get("preset", {}),
+            "selected": search.get("selected", {}),
         }
+        base_payload = unfiltered
+        if start is not None and end is not None:
+            base_payload = self._filtered_payload(unfiltered, start, end)
 
-        session = requests.Session()
-        results: list[dict] = []
-        records_filtered = (
-            es_request.get("data", {}).get("recordsFiltered")
-            or es_request.get("data", {}).get("recordsTotal")
-            or 0
-        )
-
-        page = 1
-        draw = base_payload["draw"]
-
-        while True:
-            payload = copy.deepcopy(base_payload)
-            payload.update(
-                {
-                    "page": page,
-                    "start": (page - 1) * per_page,
-                    "draw": draw,
-                }
+        try:
+            first, per_page = self._fetch_first_page(base_payload, per_page)
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if base_payload is unfiltered or status is None or status >= 500:
+                raise
+            logger.warning("Filtered listing search rejected (%s); fetching all listings", exc)
+            self.metrics.increment("fallback_unfiltered_listings")
+            base_payload = unfiltered
+            first, per_page = self._fetch_first_page(base_payload, per_page)
+        if base_payload is not unfiltered:
+            if first.get("data"):
+                if _matches_filter(first["data"], start, end):
+                    _trusted_filters.add(self.api_endpoint)
+            elif self.api_endpoint not in _trusted_filters and _reports_listings(es_request):
+                # The endpoint took the payload but may read the filter differently.
+                # An empty page says nothing about the page size honoured; negotiate again.
+                probe, probe_per_page = self._fetch_first_page(unfiltered, unfiltered["perPage"])
+                if self._build_records_from_listings(probe.get("data") or [], start, end):
+                    logger.warning(
+                        "Filtered listing search returned nothing but the unfiltered one "
+                        "has events in the window; fetching all listings"
+                    )
+                    self.metrics.increment("fallback_unfiltered_listings")
+                    base_payload = unfiltered
+                    first, per_page = probe, probe_per_page
+                else:
+                    logger.info(
+                        "Filtered listing search returned nothing and the first unfiltered "
+                        "page has no events in the window either"
+                    )
+        results: list[dict] = list(first.get("data") or [])
+        if not results:
+            return results
+
+        records_filtered = first.get("recordsFiltered") or 0
+        if not records_filtered and base_payload is unfiltered:
+            records_filtered = es_request.get("data", {}).get(
+                "recordsFiltered"
+            ) or es_request.get("data", {}).get("recordsTotal") or 0
+        if not records_filtered:
+            return self._fetch_remaining_sequentially(base_payload, per_page, results)
+
+        total_pages = math.ceil(records_filtered / per_page)
+        if total_pages > self.max_pages:
+            logger.warning(
+                "Pagination capped at %d of %d page(s) (perPage=%d); %d listing(s) "
+                "were not fetched. Raise MAX_PAGES to include them.",
+                self.max_pages,
+                total_pages,
+                per_page,
+                records_filtered - self.max_pages * per_page,
             )
+            self.metrics.increment("pagination_truncated")
+            total_pages = self.max_pages
 
-            response = session.post(
-                API_ENDPOINT, json=payload, timeout=self.timeout
+        remaining = range(2, total_pages + 1)
+        if remaining:
+            logger.info(
+                "Fetching %d more page(s) of %d listing(s) with %d worker(s)",
+                len(remaining),
+                per_page,
+                self.page_workers,
             )
-            response.raise_for_status()
-            body = response.json()
-            listings = body.get("data") or []
-            if not listings:
-                break
-
-            results.extend(listings)
-            records_filtered = body.get("recordsFiltered", records_filtered) or records_filtered
-
-            if records_filtered and len(results) >= records_filtered:
-                break
-
-            page += 1
-            draw += 1
+            with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+                pages = executor.map(
+                    lambda page: self._fetch_page(base_payload, page, per_page),
+                    remaining,
+                )
+                for body in pages:
+                    results.extend(body.get("data") or [])
 
-            if page > 50:  # safety guard
-                logger.warning("Stopping pagination after 50 pages to avoid runaway loop.")
-                break
+        return results
 
+    def _fetch_remaining_sequentially(
+        self, base_payload: dict, per_page: int, results: list[dict]
+    ) -> list[dict]:
+        for page in range(2, self.max_pages + 1):
+            listings = self._fetch_page(base_payload, page, per_page).get("data") or []
+            if not listings:
+                return results
+            results.extend(listings)
+        logger.warning(
+            "Stopping pagination after %d pages without a reported total.", self.max_pages
+        )
+        self.metrics.increment("pagination_truncated")
         return results
 
     def _build_records_from_listings(
         self, listings: Iterable[dict], start: date, end: date
     ) -> list[EventRecord]:
         records: list[EventRecord] = []
-        seen: set[tuple[str, str, date]] = set()
 
         for listing in listings:
             if (listing.get("type") or "").lower() != "concerts":
@@ -175,8 +469,8 @@ class BoxOfficeTicketSalesScraper:
                 continue
 
             try:
-                event_date = pendulum.parse(when).date()
-            except pendulum.parsing.exceptions.ParserError as exc:
+                event_date = parse_date(when)
+            except ValueError as exc:
                 logger.warning("Could not parse datetime %r: %s", when, exc)
                 continue
 
@@ -192,11 +486,6 @@ class BoxOfficeTicketSalesScraper:
             artist = performers[0].get("name") if performers else title
             artist = html.unescape(artist or "").strip()
 
-            key = (venue_name.casefold(), title.casefold(), event_date)
-            if key in seen:
-                continue
-            seen.add(key)
-
             records.append(
                 EventRecord(
                     venue=venue_name,
@@ -206,38 +495,26 @@ class BoxOfficeTicketSalesScraper:
                 )
             )
 
-        return records
+        return unique_events(records)
 
     def _collect_from_dom(self, start: date, end: date) -> list[EventRecord]:
-        records: list[EventRecord] = []
-
-        for node in self._iter_event_elements():
-            title = self._safe_text(node, EVENT_TITLE)
-            if not title:
-                continue
-
-            location = self._safe_text(node, EVENT_LOCATION)
-            venue = location.split(",")[0] if location else ""
-            month_day = self._safe_text(node, EVENT_DATE_MONTH_DAY)
-            time_text = self._safe_text(node, EVENT_DATE_TIME)
-            year = self._extract_year(node)
-
-            event_date = parse_event_date(month_day, time_text, year)
-            if not event_date:
-                continue
-
-            if start <= event_date <= end:
-                records.append(
-                    EventRecord(
-                        venue=venue,
-                        event=title,
-                        date=event_date,
-                        artist=title,
-                    )
-                )
-
+        self._load_all_events()
+        if self.recorder is not None:
+            self.recorder.save_artifact(
+                self._artifact(LISTING_DOM_ARTIFACT), self.driver.page_source
+            )
+        rows = self.driver.execute_script(
+            EXTRACT_ROWS_SCRIPT,
+            EVENT_ROW,
+            {
+                "title": EVENT_TITLE,
+                "location": EVENT_LOCATION,
+                "month_day": EVENT_DATE_MONTH_DAY,
+                "time": EVENT_DATE_TIME,
+            },
+        ) or []
+        records = records_from_rows(rows, start, end)
         logger.info(
             "Collected %d event(s) for the target week via DOM fallback", len(records)
         )
         return records
-
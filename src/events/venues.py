@@ -3,17 +3,22 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Iterable
+from urllib.parse import urlsplit
 
-import pendulum
-import requests
-
+from ..transport.client import HttpTransport
 from .models import EventRecord
+from .parsers import parse_date
 
 logger = logging.getLogger(__name__)
 
 ES_REQUEST_PATTERN = re.compile(r"esRequest\s*=\s*(\{.*?\});", re.DOTALL)
+SITE_URL = "https://www.boxofficeticketsales.com"
 
 # Explicit slug overrides when naive slugification would fail.
 VENUE_SLUG_OVERRIDES: dict[str, str] = {
@@ -38,6 +43,23 @@ def _slugify(name: str) -> str:
     return slug
 
 
+@dataclass(slots=True)
+class VenueFetchResult:
+    venue: str
+    url: str
+    events: list[EventRecord] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def venue_url(venue_name: str, base_url: str = SITE_URL) -> str:
+    return f"{base_url.rstrip('/')}/venues/{_slugify(venue_name)}"
+
+
 def _extract_es_request(html: str) -> dict:
     match = ES_REQUEST_PATTERN.search(html)
     if not match:
@@ -50,12 +72,12 @@ def fetch_venue_events(
     venue_name: str,
     start: date,
     end: date,
-    session: requests.Session | None = None,
+    session: HttpTransport | None = None,
+    base_url: str = SITE_URL,
 ) -> list[EventRecord]:
-    slug = _slugify(venue_name)
-    url = f"https://www.boxofficeticketsales.com/venues/{slug}"
+    url = venue_url(venue_name, base_url)
 
-    client = session or requests.Session()
+    client = session or HttpTransport()
     logger.debug("Fetching venue page for %s (%s)", venue_name, url)
 
     response = client.get(url, timeout=20)
@@ -73,12 +95,11 @@ def fetch_venue_events(
         if not when:
             continue
         try:
-            parsed = pendulum.parse(when)
-        except pendulum.parsing.exceptions.ParserError:
+            event_date = parse_date(when)
+        except ValueError:
             logger.warning("Could not parse datetime %r for venue %s", when, venue_name)
             continue
 
-        event_date = parsed.date()
         if not (start <= event_date <= end):
             continue
 
@@ -98,18 +119,72 @@ def fetch_venue_events(
     return events
 
 
+class _HostLimiter:
+    """Caps the number of in-flight requests per host across worker threads."""
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self._per_host)
+            return self._semaphores[host]
+
+
+def _fetch_one(
+    venue: str,
+    start: date,
+    end: date,
+    session: HttpTransport,
+    limiter: _HostLimiter,
+    base_url: str,
+) -> VenueFetchResult:
+    started = time.monotonic()
+    try:
+        url = venue_url(venue, base_url)
+    except ValueError as exc:
+        return VenueFetchResult(venue=venue, url="", error=str(exc))
+
+    try:
+        with limiter.for_url(url):
+            events = fetch_venue_events(venue, start, end, session=session, base_url=base_url)
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Failed to fetch venue %s: %s", venue, exc)
+        return VenueFetchResult(
+            venue=venue,
+            url=url,
+            elapsed=time.monotonic() - started,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return VenueFetchResult(
+        venue=venue, url=url, events=events, elapsed=time.monotonic() - started
+    )
+
+
 def fetch_target_venues(
     venues: Iterable[str],
     start: date,
     end: date,
-    session: requests.Session | None = None,
-) -> list[EventRecord]:
-    client = session or requests.Session()
-    collected: list[EventRecord] = []
-    for venue in venues:
-        try:
-            collected.extend(fetch_venue_events(venue, start, end, session=client))
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to fetch venue %s: %s", venue, exc)
-    return collected
-
+    session: HttpTransport | None = None,
+    workers: int = 8,
+    per_host_limit: int = 4,
+    base_url: str = SITE_URL,
+) -> list[VenueFetchResult]:
+    """Fetch each venue page concurrently; results keep the input order."""
+    client = session or HttpTransport()
+    limiter = _HostLimiter(per_host_limit)
+    venue_list = list(venues)
+    if not venue_list:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(venue_list)))) as executor:
+        return list(
+            executor.map(
+                lambda venue: _fetch_one(venue, start, end, client, limiter, base_url),
+                venue_list,
+            )
+        )
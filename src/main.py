@@ -5,10 +5,14 @@ import logging
 import sys
 from dataclasses import replace
 from datetime import date
+from pathlib import Path
 
 from .config import Settings
+from .pipeline.backfill import BackfillResult, run_backfill
 from .pipeline.timeframe import current_week_range
 from .pipeline.weekly_report import PipelineResult, run_weekly_report
+from .profiling import default_profile_dir, profiled
+from .transport.recording import Recorder
 
 
 def parse_args() -> argparse.Namespace:
@@ -38,7 +42,55 @@ def parse_args() -> argparse.Namespace:
         action="store_false",
         help="Disable headless browser mode.",
     )
-    return parser.parse_args()
+    capture = parser.add_mutually_exclusive_group()
+    capture.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Save every site response and browser page source to DIR.",
+    )
+    capture.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help=(
+            "Run against a recording in DIR: no network, no Chrome, in-memory sheet. "
+            "Defaults to the recording's --start/--end."
+        ),
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Process --start..--end week by week, checkpointing each finished week.",
+    )
+    parser.add_argument(
+        "--backfill-workers",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Weeks scraped concurrently in backfill mode (default: 2).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        metavar="FILE",
+        help="Backfill checkpoint file. Defaults to data/backfill/<start>_<end>.json.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=default_profile_dir("main"),
+        metavar="DIR",
+        help="Capture cProfile stats and per-stage memory snapshots "
+        "(default: data/profiles/main-<timestamp>).",
+    )
+    args = parser.parse_args()
+    if args.backfill and (args.record or args.replay):
+        parser.error("--backfill cannot be combined with --record or --replay")
+    if args.backfill and not (args.start and args.end):
+        parser.error("--backfill needs both --start and --end")
+    return args
 
 
 def log_validation_failures(result: PipelineResult) -> None:
@@ -54,6 +106,39 @@ def log_validation_failures(result: PipelineResult) -> None:
         )
 
 
+def log_venue_results(result: PipelineResult) -> None:
+    for venue in result.venues:
+        if venue.ok:
+            logging.info(
+                "Venue %s: %d event(s) in %.2fs",
+                venue.venue,
+                len(venue.events),
+                venue.elapsed,
+            )
+        else:
+            logging.warning(
+                "Venue %s failed after %.2fs: %s", venue.venue, venue.elapsed, venue.error
+            )
+
+
+def log_backfill_result(result: BackfillResult) -> int:
+    logging.info(
+        "Backfill: %d week(s) total, %d resumed from checkpoint, %d completed, "
+        "%d failed; %d row(s) inserted.",
+        result.partitions,
+        result.resumed,
+        result.completed,
+        len(result.failed),
+        result.inserted,
+    )
+    for start, end, error in result.failed:
+        logging.error("Week %s..%s failed: %s", start, end, error)
+    if result.failed:
+        logging.error("Re-run the same command to retry the failed week(s).")
+        return 1
+    return 0
+
+
 def main() -> int:
     logging.basicConfig(
         level=logging.INFO,
@@ -71,6 +156,10 @@ def main() -> int:
         settings = replace(settings, headless=args.headless)
 
     start, end = current_week_range()
+    if args.replay and not (args.start or args.end):
+        recorded = Recorder(args.replay).load_window()
+        if recorded is not None:
+            start, end = recorded
     if args.start:
         start = args.start
     if args.end:
@@ -78,7 +167,31 @@ def main() -> int:
 
     logging.info("Targeting events from %s to %s", start, end)
 
-    result = run_weekly_report(settings=settings, start=start, end=end)
+    with profiled(args.profile):
+        if args.backfill:
+            return log_backfill_result(
+                run_backfill(
+                    settings,
+                    start,
+                    end,
+                    workers=args.backfill_workers,
+                    checkpoint_path=args.checkpoint,
+                )
+            )
+
+        try:
+            result = run_weekly_report(
+                settings=settings,
+                start=start,
+                end=end,
+                record_dir=args.record,
+                replay_dir=args.replay,
+            )
+        except RuntimeError as exc:
+            if args.replay is None:
+                raise
+            logging.error("%s", exc)
+            return 1
 
     logging.info(
         "Fetched %d event(s); %d valid; %d new; %d inserted.",
@@ -87,6 +200,7 @@ def main() -> int:
         result.new,
         result.inserted,
     )
+    log_venue_results(result)
     log_validation_failures(result)
 
     return 0
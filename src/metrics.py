@@ -0,0 +1,135 @@
+"""In-process run metrics: stage timings, request histograms and counters."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from .profiling import stage_boundary
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (hits counter, *miss counters) reported as hit ratios.
+HIT_RATIOS = {
+    "http": ("http_cache_hits", "http_cache_misses", "http_cache_unchanged"),
+    "event": ("event_cache_known", "event_cache_new"),
+    "sheet_index": ("sheet_index_hits", "sheet_index_misses"),
+}
+
+
+@dataclass(slots=True)
+class Histogram:
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """``(le, count)`` pairs in Prometheus bucket order, ending with ``+Inf``."""
+        running = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            buckets.append(("+Inf" if bound == float("inf") else f"{bound:g}", running))
+        return buckets
+
+
+@dataclass(slots=True)
+class RequestStats:
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+
+@dataclass(slots=True)
+class StageStats:
+    seconds: float = 0.0
+    calls: int = 0
+
+
+class RunMetrics:
+    """Thread-safe collector shared by every component of one run.
+
+    Stage times are summed across threads, so a stage run by several sources at
+    once can exceed the run's wall time; ``collect`` and ``store`` are the
+    top-level wall-clock stages.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stages: dict[str, StageStats] = {}
+        self.requests: dict[str, RequestStats] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+                stats.seconds += elapsed
+                stats.calls += 1
+            stage_boundary(name)
+
+    def observe_request(self, target: str, elapsed: float, size: int, ok: bool = True) -> None:
+        with self._lock:
+            stats = self.requests.setdefault(target, RequestStats())
+            stats.requests += 1
+            stats.bytes += size
+            if not ok:
+                stats.errors += 1
+            stats.latency.observe(elapsed)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def hit_ratios(self) -> dict[str, float]:
+        ratios = {}
+        for cache, (hit_name, *miss_names) in HIT_RATIOS.items():
+            hits = self.counters.get(hit_name, 0)
+            total = hits + sum(self.counters.get(name, 0) for name in miss_names)
+            if total:
+                ratios[cache] = hits / total
+        return ratios
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "stages": {
+                    name: {"seconds": round(stats.seconds, 6), "calls": stats.calls}
+                    for name, stats in self.stages.items()
+                },
+                "requests": {
+                    target: {
+                        "requests": stats.requests,
+                        "errors": stats.errors,
+                        "bytes": stats.bytes,
+                        "latency_seconds": {
+                            "sum": round(stats.latency.total, 6),
+                            "buckets": dict(stats.latency.cumulative()),
+                        },
+                    }
+                    for target, stats in self.requests.items()
+                },
+                "counters": dict(self.counters),
+                "hit_ratios": self.hit_ratios(),
+            }
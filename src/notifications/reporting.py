@@ -1,14 +1,130 @@
-from __future__ import annotations
-
 """
-Notification/reporting module placeholder.
+Run reporting: stage timings and request stats for each pipeline run.
+
+``report_run`` logs a one-line stage summary and writes the run's metrics as
+JSON (``METRICS_FILE``) and as a Prometheus textfile-collector file
+(``PROMETHEUS_TEXTFILE``), so node_exporter can scrape the last run.
 
 Potential future implementations:
 - Email summaries (via SMTP or transactional provider API)
 - Slack/Teams webhook notifications
 - Logging to an Airtable/Notion database for historical reports
-
-Expose a function `notify(result: PipelineResult)` that formats the pipeline
-output and dispatches messages.
 """
 
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..config import Settings
+from ..metrics import RunMetrics
+
+if TYPE_CHECKING:
+    from ..pipeline.weekly_report import PipelineResult
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "showsintown"
+
+
+def report_run(settings: Settings, result: "PipelineResult") -> None:
+    counts = {
+        "fetched": result.fetched,
+        "valid": result.valid,
+        "invalid": len(result.invalid),
+        "new": result.new,
+        "inserted": result.inserted,
+    }
+    report_metrics(settings, result.metrics, counts)
+
+
+def report_metrics(settings: Settings, metrics: RunMetrics, counts: dict[str, int]) -> None:
+    log_stage_summary(metrics)
+    try:
+        if settings.metrics_file is not None:
+            write_metrics_json(settings.metrics_file, metrics, counts)
+        if settings.prometheus_textfile is not None:
+            write_prometheus_textfile(settings.prometheus_textfile, metrics, counts)
+    except OSError as exc:
+        logger.warning("Could not write run metrics: %s", exc)
+
+
+def log_stage_summary(metrics: RunMetrics) -> None:
+    snapshot = metrics.to_dict()
+    stages = ", ".join(
+        f"{name} {stats['seconds']:.2f}s" for name, stats in snapshot["stages"].items()
+    )
+    requests = ", ".join(
+        f"{target} {stats['requests']} req/{stats['bytes'] / 1024:.0f} KiB"
+        for target, stats in snapshot["requests"].items()
+    )
+    logger.info("Stages: %s", stages or "none")
+    if requests:
+        logger.info("Requests: %s", requests)
+
+
+def write_metrics_json(path: Path, metrics: RunMetrics, counts: dict[str, int]) -> None:
+    payload = {"finished": time.time(), "counts": counts, **metrics.to_dict()}
+    _atomic_write(path, json.dumps(payload, indent=2, sort_keys=True))
+
+
+def write_prometheus_textfile(path: Path, metrics: RunMetrics, counts: dict[str, int]) -> None:
+    snapshot = metrics.to_dict()
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        metric = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        return metric
+
+    metric = family("last_run_timestamp_seconds", "gauge", "Unix time the last run finished.")
+    lines.append(f"{metric} {time.time():.0f}")
+
+    metric = family("events", "gauge", "Events per pipeline step in the last run.")
+    for kind, value in counts.items():
+        lines.append(f'{metric}{{kind="{kind}"}} {value}')
+
+    metric = family("stage_seconds", "gauge", "Time spent per pipeline stage in the last run.")
+    for name, stats in snapshot["stages"].items():
+        lines.append(f'{metric}{{stage="{name}"}} {stats["seconds"]}')
+
+    requests = snapshot["requests"]
+    for field, help_text in (
+        ("requests", "Requests sent in the last run."),
+        ("errors", "Failed requests in the last run."),
+        ("bytes", "Response (site) or payload (sheets) bytes in the last run."),
+    ):
+        metric = family(f"http_{field}", "gauge", help_text)
+        for target, stats in requests.items():
+            lines.append(f'{metric}{{target="{target}"}} {stats[field]}')
+
+    metric = family("http_request_duration_seconds", "histogram", "Request latency.")
+    for target, stats in requests.items():
+        latency = stats["latency_seconds"]
+        for bound, count in latency["buckets"].items():
+            lines.append(f'{metric}_bucket{{target="{target}",le="{bound}"}} {count}')
+        lines.append(f'{metric}_sum{{target="{target}"}} {latency["sum"]}')
+        lines.append(f'{metric}_count{{target="{target}"}} {stats["requests"]}')
+
+    metric = family("cache_hit_ratio", "gauge", "Share of lookups answered by each cache.")
+    for cache, ratio in snapshot["hit_ratios"].items():
+        lines.append(f'{metric}{{cache="{cache}"}} {ratio:.4f}')
+
+    metric = family("run_counter", "gauge", "Fallback activations and other run counters.")
+    for name, value in snapshot["counters"].items():
+        lines.append(f'{metric}{{name="{name}"}} {value}')
+
+    _atomic_write(path, "\n".join(lines) + "\n")
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """The textfile collector may read at any time, so never expose a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -0,0 +1,198 @@
+"""Multi-week backfills: one partition per week, checkpointed as each finishes."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+
+from ..cache.storage import EventCache
+from ..config import Settings
+from ..events.browser import BrowserPool
+from ..metrics import RunMetrics
+from ..notifications.reporting import report_metrics
+from ..sheets.client import SheetsClient
+from .timeframe import week_partitions
+from .weekly_report import (
+    PipelineResult,
+    build_driver_factory,
+    build_sheets_client,
+    build_transport,
+    collect_events,
+    store_events,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = Path("data/backfill")
+
+
+def default_checkpoint_path(start: date, end: date) -> Path:
+    return CHECKPOINT_DIR / f"{start.isoformat()}_{end.isoformat()}.json"
+
+
+@dataclass(slots=True)
+class BackfillCheckpoint:
+    """Completed partitions of one backfill range, keyed by their start date."""
+
+    path: Path
+    start: date
+    end: date
+    completed: dict[str, dict] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, start: date, end: date) -> "BackfillCheckpoint":
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return cls(path=path, start=start, end=end)
+        if raw.get("start") != start.isoformat() or raw.get("end") != end.isoformat():
+            logger.warning("Ignoring checkpoint %s: it covers a different range", path)
+            return cls(path=path, start=start, end=end)
+        return cls(path=path, start=start, end=end, completed=raw.get("completed", {}))
+
+    def is_done(self, partition: tuple[date, date]) -> bool:
+        return partition[0].isoformat() in self.completed
+
+    def mark_done(self, partition: tuple[date, date], result: PipelineResult) -> None:
+        self.completed[partition[0].isoformat()] = {
+            "end": partition[1].isoformat(),
+            "fetched": result.fetched,
+            "valid": result.valid,
+            "new": result.new,
+            "inserted": result.inserted,
+        }
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "completed": self.completed,
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+@dataclass(slots=True)
+class BackfillResult:
+    partitions: int
+    resumed: int
+    completed: int = 0
+    inserted: int = 0
+    failed: list[tuple[date, date, str]] = field(default_factory=list)
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+
+
+def run_backfill(
+    settings: Settings,
+    start: date,
+    end: date,
+    workers: int = 2,
+    checkpoint_path: Path | None = None,
+    spreadsheet=None,
+) -> BackfillResult:
+    """Process ``start..end`` week by week, skipping partitions already checkpointed.
+
+    Partitions are scraped concurrently over one transport, browser pool and
+    Sheets client; cache filtering, the sheet write and the checkpoint update
+    run one partition at a time so rows are never interleaved. A failed
+    partition is logged and left out of the checkpoint, so re-running the same
+    range picks it up again. The event cache keeps every partition's rows until
+    the end, when ``cache_retention_days`` is applied once.
+    """
+    checkpoint = BackfillCheckpoint.load(
+        checkpoint_path or default_checkpoint_path(start, end), start, end
+    )
+    partitions = week_partitions(start, end)
+    pending = [partition for partition in partitions if not checkpoint.is_done(partition)]
+    summary = BackfillResult(partitions=len(partitions), resumed=len(partitions) - len(pending))
+    if summary.resumed:
+        logger.info(
+            "Resuming backfill from %s: %d of %d week(s) already done",
+            checkpoint.path,
+            summary.resumed,
+            len(partitions),
+        )
+    if not pending:
+        return summary
+
+    metrics = summary.metrics
+    # Past weeks are older than the retention window; compacting on every
+    # partition's open would evict the previous partitions' rows.
+    store_settings = replace(settings, cache_retention_days=None)
+    transport = build_transport(settings, metrics=metrics)
+    pool = BrowserPool(
+        build_driver_factory(settings), size=settings.browser_pool_size, metrics=metrics
+    )
+    write_lock = threading.Lock()
+    sheets: list[SheetsClient] = []
+
+    def sheets_factory() -> SheetsClient:
+        if not sheets:
+            sheets.append(build_sheets_client(settings, spreadsheet, metrics))
+        return sheets[0]
+
+    def process(partition: tuple[date, date]) -> PipelineResult:
+        with metrics.stage("collect"):
+            results = collect_events(
+                settings, partition[0], partition[1], transport, pool, metrics=metrics
+            )
+        with write_lock, metrics.stage("store"):
+            result = store_events(store_settings, results, sheets_factory, metrics)
+            checkpoint.mark_done(partition, result)
+        return result
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="backfill"
+        ) as executor:
+            futures = {executor.submit(process, partition): partition for partition in pending}
+            for future in as_completed(futures):
+                part_start, part_end = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Week %s..%s failed: %s", part_start, part_end, exc)
+                    summary.failed.append((part_start, part_end, str(exc)))
+                    continue
+                summary.completed += 1
+                summary.inserted += result.inserted
+                logger.info(
+                    "Week %s..%s done: %d fetched, %d inserted (%d/%d)",
+                    part_start,
+                    part_end,
+                    result.fetched,
+                    result.inserted,
+                    summary.resumed + summary.completed,
+                    summary.partitions,
+                )
+    finally:
+        pool.close()
+        transport.close()
+    if settings.cache_retention_days is not None:
+        with metrics.stage("event_cache"):
+            cache = EventCache(settings.cache_file)
+            try:
+                cache.compact(settings.cache_retention_days)
+            finally:
+                cache.close()
+    report_metrics(
+        settings,
+        metrics,
+        {
+            "partitions": summary.partitions,
+            "resumed": summary.resumed,
+            "completed": summary.completed,
+            "failed": len(summary.failed),
+            "inserted": summary.inserted,
+        },
+    )
+    return summary
@@ -3,12 +3,15 @@ from __future__ import annotations
 import argparse
 import logging
 from html import unescape
+from pathlib import Path
 from typing import Iterable
 
-import pendulum
+from gspread.utils import rowcol_to_a1
 
 from ..config import Settings
-from ..sheets.client import HEADER, SheetsClient
+from ..events.parsers import parse_date
+from ..profiling import default_profile_dir, profiled, stage_boundary
+from ..sheets.client import HEADER, KEY_CHUNK_ROWS, SheetsClient
 
 logger = logging.getLogger(__name__)
 
@@ -22,32 +25,68 @@ def _sanitize_row(row: list[str]) -> list[str]:
     date_value = sanitized[2]
     if date_value:
         try:
-            parsed = pendulum.parse(date_value, strict=False)
-            sanitized[2] = parsed.to_date_string()
-        except (pendulum.parsing.exceptions.ParserError, ValueError, TypeError) as exc:
+            sanitized[2] = parse_date(date_value).isoformat()
+        except (ValueError, TypeError) as exc:
             logger.warning("Could not normalize date %r: %s", date_value, exc)
     return sanitized
 
 
-def normalize_master_sheet(settings: Settings) -> int:
-    client = SheetsClient(settings.spreadsheet_id, str(settings.service_account_file))
-    rows = client.fetch_rows()
-    if not rows:
-        client.ensure_header()
-        return 0
+def _diff_row(row_number: int, original: list[str], sanitized: list[str]):
+    """Return the ``(a1_range, values)`` covering the changed cells of one row."""
+    padded = original + [""] * max(0, len(HEADER) - len(original))
+    changed = [index for index, value in enumerate(sanitized) if value != padded[index]]
+    if not changed:
+        return None
+    first, last = changed[0], changed[-1]
+    a1 = f"{rowcol_to_a1(row_number, first + 1)}:{rowcol_to_a1(row_number, last + 1)}"
+    return a1, [sanitized[first : last + 1]]
 
-    header, *data_rows = rows
-    normalized = [_sanitize_row(row) for row in data_rows]
-    client.overwrite_rows([HEADER] + normalized)
-    logger.info("Normalized %d existing row(s) in the Master sheet.", len(normalized))
-    return len(normalized)
+
+def normalize_master_sheet(settings: Settings, chunk_rows: int = KEY_CHUNK_ROWS) -> int:
+    """Normalize the sheet in place, writing only cells whose value changes.
+
+    Rows are streamed ``chunk_rows`` at a time and each chunk's changes are
+    flushed before the next is read, so memory stays bounded by the chunk.
+    """
+    client = SheetsClient(
+        settings.spreadsheet_id,
+        str(settings.service_account_file),
+        index_path=settings.sheet_index_file,
+    )
+    client.ensure_header()
+    stage_boundary("ensure_header")
+
+    scanned = 0
+    changed = 0
+    for first_row, rows in client.iter_row_chunks(chunk_rows):
+        updates = []
+        for offset, row in enumerate(rows):
+            update = _diff_row(first_row + offset, row, _sanitize_row(row))
+            if update:
+                updates.append(update)
+        client.write_ranges(updates)
+        scanned += len(rows)
+        changed += len(updates)
+
+    stage_boundary("normalize")
+    logger.info("Normalized %d of %d existing row(s) in the Master sheet.", changed, scanned)
+    return changed
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Normalize existing rows in the Master sheet (dates, HTML entities, remove openers)."
     )
-    parser.parse_args()
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=default_profile_dir("cleanup"),
+        metavar="DIR",
+        help="Capture cProfile stats and per-stage memory snapshots "
+        "(default: data/profiles/cleanup-<timestamp>).",
+    )
+    args = parser.parse_args()
 
     logging.basicConfig(
         level=logging.INFO,
@@ -60,7 +99,8 @@ def main() -> int:
         logger.error("%s", exc)
         return 1
 
-    normalize_master_sheet(settings)
+    with profiled(args.profile):
+        normalize_master_sheet(settings)
     return 0
 
 
@@ -0,0 +1,62 @@
+"""Standalone retention pass over the local event cache."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from ..cache.storage import CompactionReport, EventCache
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def compact_event_cache(settings: Settings, retention_days: int) -> CompactionReport:
+    cache = EventCache(settings.cache_file)
+    try:
+        report = cache.compact(retention_days, vacuum=True)
+    finally:
+        cache.close()
+    logger.info(
+        "Removed %d event(s) dated before %s; %d remain; reclaimed %.1f KiB.",
+        report.removed,
+        report.cutoff,
+        report.remaining,
+        report.bytes_reclaimed / 1024,
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Drop past events from the local cache and shrink the file."
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        help="Keep events up to this many days in the past. Defaults to CACHE_RETENTION_DAYS.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    try:
+        settings = Settings.from_env()
+    except RuntimeError as exc:
+        logger.error("%s", exc)
+        return 1
+
+    retention_days = args.days if args.days is not None else settings.cache_retention_days
+    if retention_days is None:
+        logger.error("No retention window given; pass --days or set CACHE_RETENTION_DAYS.")
+        return 1
+
+    compact_event_cache(settings, retention_days)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
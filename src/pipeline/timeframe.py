@@ -9,3 +9,13 @@ def current_week_range(reference: date | None = None) -> tuple[date, date]:
     end = start + timedelta(days=6)
     return start, end
 
+
+def week_partitions(start: date, end: date) -> list[tuple[date, date]]:
+    """Split ``start..end`` into Monday-Sunday weeks, clipped to the range."""
+    partitions = []
+    current = start
+    while current <= end:
+        week_end = min(current + timedelta(days=6 - current.weekday()), end)
+        partitions.append((current, week_end))
+        current = week_end + timedelta(days=1)
+    return partitions
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Callable
 
 from ..cache.storage import EventCache
-from ..config import Settings
-from ..events.browser import create_driver
+from ..config import Settings, SourceConfig
+from ..events.batch import EventBatch
+from ..events.browser import BrowserPool, create_driver
 from ..events.scraper import BoxOfficeTicketSalesScraper
-from ..events.venues import fetch_target_venues
+from ..events.venues import VenueFetchResult, fetch_target_venues
+from ..metrics import RunMetrics
+from ..notifications.reporting import report_run
 from ..sheets.client import SheetsClient
-from ..validation.events import ValidationResult, filter_valid_events
+from ..sheets.memory import InMemorySpreadsheet
+from ..transport.cache import HttpCache
+from ..transport.client import HttpTransport
+from ..transport.recording import Recorder, RecordingTransport, ReplayTransport
+from ..validation.events import ValidationResult, filter_valid_batch
 
 logger = logging.getLogger(__name__)
 
@@ -22,51 +34,354 @@ class PipelineResult:
     new: int
     inserted: int
     invalid: list[ValidationResult]
+    venues: list[VenueFetchResult] = field(default_factory=list)
+    metrics: RunMetrics = field(default_factory=RunMetrics)
 
 
-def run_weekly_report(settings: Settings, start: date, end: date) -> PipelineResult:
-    driver = create_driver(headless=settings.headless)
+@dataclass(slots=True)
+class SourceResult:
+    source: SourceConfig
+    fetched: int
+    valid: EventBatch
+    invalid: list[ValidationResult]
+    venues: list[VenueFetchResult]
+
+
+def build_transport(
+    settings: Settings,
+    recorder: Recorder | None = None,
+    metrics: RunMetrics | None = None,
+) -> HttpTransport:
+    cache = None
+    if settings.http_cache_dir is not None:
+        cache = HttpCache(
+            settings.http_cache_dir,
+            max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+            max_age=settings.http_cache_max_age_days * 24 * 3600,
+        )
+    options = dict(
+        pool_size=max(settings.page_workers, settings.venue_workers) * 2,
+        max_retries=settings.http_max_retries,
+        rate_per_host=settings.http_rate_limit,
+        timeout=settings.timeout,
+        cache=cache,
+        metrics=metrics,
+    )
+    if recorder is not None:
+        return RecordingTransport(recorder, **options)
+    return HttpTransport(**options)
+
+
+def build_driver_factory(settings: Settings) -> Callable:
+    return partial(
+        create_driver,
+        headless=settings.headless,
+        driver_path=settings.chromedriver_path,
+        driver_path_cache=settings.driver_path_cache,
+        offline=settings.driver_offline,
+        block_resources=settings.block_resources,
+    )
+
+
+def build_sheets_client(
+    settings: Settings, spreadsheet=None, metrics: RunMetrics | None = None
+) -> SheetsClient:
+    return SheetsClient(
+        spreadsheet_id=settings.spreadsheet_id,
+        service_account_file=str(settings.service_account_file),
+        index_path=settings.sheet_index_file,
+        spreadsheet=spreadsheet,
+        metrics=metrics,
+    )
+
+
+def run_weekly_report(
+    settings: Settings,
+    start: date,
+    end: date,
+    record_dir: Path | None = None,
+    replay_dir: Path | None = None,
+    spreadsheet=None,
+) -> PipelineResult:
+    """Run the weekly pipeline.
+
+    ``record_dir`` saves every site response (plus the ``esRequest`` block and
+    any browser page source) as the run goes. ``replay_dir`` runs the whole
+    pipeline against such a recording with no network, no Chrome, a throwaway
+    event cache and an in-memory sheet. ``spreadsheet`` replaces the Google
+    Sheets backend (e.g. an ``InMemorySpreadsheet`` for load tests).
+
+    Stage timings, request stats and counters end up on ``result.metrics`` and
+    in the files named by ``METRICS_FILE`` and ``PROMETHEUS_TEXTFILE``.
+    """
+    if replay_dir is not None:
+        result = _replay(settings, start, end, Recorder(replay_dir))
+        # Only log a replay: its counts come from a throwaway sheet and must not
+        # replace the last real run in the metrics file node_exporter scrapes.
+        report_run(replace(settings, metrics_file=None, prometheus_textfile=None), result)
+        return result
+
+    metrics = RunMetrics()
+    recorder = Recorder(record_dir) if record_dir is not None else None
+    if recorder is not None:
+        recorder.save_window(start, end)
+    transport = build_transport(settings, recorder, metrics)
+    try:
+        result = _run(
+            settings,
+            start,
+            end,
+            transport,
+            driver_factory=build_driver_factory(settings),
+            sheets_factory=partial(build_sheets_client, settings, spreadsheet, metrics),
+            recorder=recorder,
+            metrics=metrics,
+        )
+    finally:
+        transport.close()
+    report_run(settings, result)
+    return result
+
+
+def _replay(settings: Settings, start: date, end: date, recorder: Recorder) -> PipelineResult:
+    recorded = recorder.load_window()
+    if recorded is not None and recorded != (start, end):
+        raise RuntimeError(
+            f"Recording {recorder.directory} covers {recorded[0]}..{recorded[1]}, not "
+            f"{start}..{end}; replay it without --start/--end to use its window."
+        )
+    logger.info("Replaying recorded run from %s", recorder.directory)
+    with tempfile.TemporaryDirectory(prefix="showsintown-replay-") as scratch:
+        settings = replace(
+            settings,
+            cache_file=Path(scratch) / "events_cache.sqlite3",
+            sheet_index_file=None,
+            http_cache_dir=None,
+        )
+        spreadsheet = InMemorySpreadsheet()
+        metrics = RunMetrics()
+        try:
+            return _run(
+                settings,
+                start,
+                end,
+                ReplayTransport(recorder),
+                driver_factory=None,
+                sheets_factory=lambda: SheetsClient(
+                    settings.spreadsheet_id, "", spreadsheet=spreadsheet, metrics=metrics
+                ),
+                recorder=recorder,
+                metrics=metrics,
+            )
+        except RuntimeError as exc:
+            # Typically a listing request the recording doesn't have, which ends
+            # in the browser fallback that replay cannot start.
+            raise RuntimeError(
+                f"Replay of {recorder.directory} for {start}..{end} needed data that was "
+                f"not recorded ({exc}). Recordings only replay for the --start/--end "
+                "they were made with."
+            ) from exc
+
+
+def _run(
+    settings: Settings,
+    start: date,
+    end: date,
+    transport: HttpTransport,
+    driver_factory: Callable | None,
+    sheets_factory: Callable[[], SheetsClient],
+    recorder: Recorder | None = None,
+    metrics: RunMetrics | None = None,
+) -> PipelineResult:
+    """Scrape every configured source concurrently, then write once.
+
+    Sources share ``transport``, a ``BrowserPool`` of at most
+    ``browser_pool_size`` Chrome sessions and a single ``SheetsClient``.
+    """
+    metrics = metrics or RunMetrics()
+    pool = (
+        BrowserPool(driver_factory, size=settings.browser_pool_size, metrics=metrics)
+        if driver_factory is not None
+        else None
+    )
     try:
-        scraper = BoxOfficeTicketSalesScraper(
-            driver=driver,
-            source_url=settings.source_url,
-            timeout=settings.timeout,
+        with metrics.stage("collect"):
+            results = collect_events(settings, start, end, transport, pool, recorder, metrics)
+    finally:
+        if pool is not None:
+            pool.close()
+    with metrics.stage("store"):
+        return store_events(settings, results, sheets_factory, metrics)
+
+
+def collect_events(
+    settings: Settings,
+    start: date,
+    end: date,
+    transport: HttpTransport,
+    pool: BrowserPool | None,
+    recorder: Recorder | None = None,
+    metrics: RunMetrics | None = None,
+) -> list[SourceResult]:
+    """Scrape and validate ``start..end`` for every source, without writing anything."""
+    sources = settings.resolved_sources()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(settings.source_workers, len(sources))),
+        thread_name_prefix="source",
+    ) as executor:
+        return list(
+            executor.map(
+                lambda source: _scrape_source(
+                    settings,
+                    source,
+                    start,
+                    end,
+                    transport,
+                    pool,
+                    recorder,
+                    artifact_prefix=f"{source.name}." if len(sources) > 1 else "",
+                    metrics=metrics,
+                ),
+                sources,
+            )
         )
+
+
+def store_events(
+    settings: Settings,
+    results: list[SourceResult],
+    sheets_factory: Callable[[], SheetsClient],
+    metrics: RunMetrics | None = None,
+) -> PipelineResult:
+    """Dedupe the merged sources, filter them through the cache and append the new ones.
+
+    Each destination tab is deduped and cache-filtered on its own, so an event
+    listed by sources writing to different tabs lands in each of them. Within a
+    tab, duplicates (by ``EventRecord.key``) across sources and venue pages keep
+    the first occurrence, so listing data wins over supplemental venue data.
+    """
+    metrics = metrics or RunMetrics()
+    batches_by_tab: dict[str, list[EventBatch]] = {}
+    for result in results:
+        batches_by_tab.setdefault(result.source.tab, []).append(result.valid)
+
+    valid_by_tab: dict[str, EventBatch] = {}
+    for tab, batches in batches_by_tab.items():
+        merged = EventBatch.concat(batches)
+        keep = merged.first_occurrences()
+        dropped = len(merged) - len(keep)
+        metrics.increment("duplicates_dropped", dropped)
+        if dropped:
+            logger.info("Dropped %d duplicate event(s) for tab %s after merging", dropped, tab)
+            merged = merged.take(keep)
+        valid_by_tab[tab] = merged
+    valid = sum(len(batch) for batch in valid_by_tab.values())
+
+    with metrics.stage("event_cache"):
+        cache = EventCache(settings.cache_file, retention_days=settings.cache_retention_days)
+    try:
+        with metrics.stage("event_cache"):
+            new_by_tab = {
+                tab: batch.take(cache.unseen_indices(batch, tab))
+                for tab, batch in valid_by_tab.items()
+            }
+        new = sum(len(batch) for batch in new_by_tab.values())
+        metrics.increment("event_cache_known", valid - new)
+        metrics.increment("event_cache_new", new)
+
+        inserted = 0
+        if new:
+            new_by_tab = {tab: batch for tab, batch in new_by_tab.items() if batch}
+            with metrics.stage("sheets"):
+                sheets = sheets_factory()
+                inserted = sum(sheets.upsert_tabs(new_by_tab).values())
+            with metrics.stage("event_cache"):
+                for tab, batch in new_by_tab.items():
+                    cache.record_events(batch, tab)
+        else:
+            logger.info("No new events to insert after cache filtering.")
+    finally:
+        cache.close()
+
+    return PipelineResult(
+        fetched=sum(result.fetched for result in results),
+        valid=valid,
+        new=new,
+        inserted=inserted,
+        invalid=[item for result in results for item in result.invalid],
+        venues=[item for result in results for item in result.venues],
+        metrics=metrics,
+    )
+
+
+def _scrape_source(
+    settings: Settings,
+    source: SourceConfig,
+    start: date,
+    end: date,
+    transport: HttpTransport,
+    pool: BrowserPool | None,
+    recorder: Recorder | None,
+    artifact_prefix: str = "",
+    metrics: RunMetrics | None = None,
+) -> SourceResult:
+    scraper = BoxOfficeTicketSalesScraper(
+        source_url=source.url,
+        timeout=settings.timeout,
+        driver_factory=pool.acquire if pool is not None else None,
+        session=transport,
+        driver_release=pool.release if pool is not None else None,
+        scroll_deadline=settings.scroll_timeout,
+        max_pages=settings.max_pages,
+        page_workers=settings.page_workers,
+        recorder=recorder,
+        artifact_prefix=artifact_prefix,
+        metrics=metrics,
+    )
+    try:
         raw_events = scraper.collect_week_events(start, end)
     finally:
-        driver.quit()
+        scraper.close()
 
-    valid_events, invalid_results = filter_valid_events(raw_events, start, end)
+    metrics = scraper.metrics
+    with metrics.stage("validation"):
+        scraped = EventBatch.from_records(raw_events)
+        valid, invalid_results = filter_valid_batch(scraped, start, end, records=raw_events)
 
-    if settings.target_venues:
+    venue_results: list[VenueFetchResult] = []
+    if source.target_venues:
         logger.info(
             "Fetching supplemental events for venues: %s",
-            ", ".join(settings.target_venues),
+            ", ".join(source.target_venues),
         )
-        supplemental = fetch_target_venues(settings.target_venues, start, end)
+        with metrics.stage("venue_pages"):
+            venue_results = fetch_target_venues(
+                source.target_venues,
+                start,
+                end,
+                session=transport,
+                workers=settings.venue_workers,
+                per_host_limit=settings.venue_host_limit,
+                base_url=source.site_url,
+            )
+        supplemental = [event for result in venue_results for event in result.events]
+        failed = [result for result in venue_results if not result.ok]
+        metrics.increment("venue_failures", len(failed))
+        if failed:
+            logger.warning(
+                "%d of %d venue page(s) failed: %s",
+                len(failed),
+                len(venue_results),
+                ", ".join(result.venue for result in failed),
+            )
         if supplemental:
             logger.info("Retrieved %d supplemental venue event(s)", len(supplemental))
-            valid_events.extend(supplemental)
+            valid = EventBatch.concat([valid, EventBatch.from_records(supplemental)])
 
-    cache = EventCache(settings.cache_file)
-    new_events = cache.filter_new(valid_events)
-
-    inserted = 0
-    if new_events:
-        sheets = SheetsClient(
-            spreadsheet_id=settings.spreadsheet_id,
-            service_account_file=str(settings.service_account_file),
-        )
-        inserted = sheets.upsert_events(new_events)
-        cache.record_events(new_events)
-    else:
-        logger.info("No new events to insert after cache filtering.")
-
-    return PipelineResult(
+    return SourceResult(
+        source=source,
         fetched=len(raw_events),
-        valid=len(valid_events),
-        new=len(new_events),
-        inserted=inserted,
+        valid=valid,
         invalid=invalid_results,
+        venues=venue_results,
     )
-
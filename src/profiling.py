@@ -0,0 +1,150 @@
+"""Opt-in cProfile + tracemalloc capture for the CLI entry points (``--profile``)."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+PROFILE_DIR = Path("data/profiles")
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+# Boundaries that also record top allocations; every other stage only records
+# current/peak memory, since a full tracemalloc snapshot is expensive enough
+# to dominate the profile.
+DETAILED_STAGES = frozenset({"collect", "store", "ensure_header", "normalize", "exit"})
+# From 3.12 cProfile sits on sys.monitoring: one enabled Profile sees every
+# thread and a second one raises "Another profiling tool is already active".
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+_active: "Profiler | None" = None
+
+
+def default_profile_dir(command: str) -> Path:
+    return PROFILE_DIR / f"{command}-{datetime.now():%Y%m%d-%H%M%S}"
+
+
+def stage_boundary(label: str) -> None:
+    """Record memory under ``label`` if a profile is running; otherwise a no-op."""
+    if _active is not None:
+        _active.snapshot(label)
+
+
+@dataclass(slots=True)
+class MemorySnapshot:
+    label: str
+    elapsed: float
+    current: int
+    peak: int
+    top: list[str]
+
+
+class Profiler:
+    """Profiles the calling thread and every thread started while it runs.
+
+    Before Python 3.12 worker threads (page, venue and source pools) each get
+    their own ``cProfile.Profile`` via ``threading.setprofile`` and the stats
+    are merged on ``stop``; later versions record every thread in the main one.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.snapshots: list[MemorySnapshot] = []
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        tracemalloc.start()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._profile_thread)
+        self._profiles.append(cProfile.Profile())
+        self._profiles[0].enable()
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # Runs once as the thread's first profile event, then hands over to cProfile.
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        sys.setprofile(None)
+        profile.enable()
+
+    def snapshot(self, label: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        statistics = []
+        if label in DETAILED_STAGES:
+            statistics = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        with self._lock:
+            self.snapshots.append(
+                MemorySnapshot(
+                    label=label,
+                    elapsed=time.perf_counter() - self._started,
+                    current=current,
+                    peak=peak,
+                    top=[str(stat) for stat in statistics],
+                )
+            )
+
+    def stop(self) -> str:
+        """Write the dumps to ``directory`` and return the exit summary."""
+        self._profiles[0].disable()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        self.snapshot("exit")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(*self._profiles)
+        stats.dump_stats(self.directory / "profile.pstats")
+
+        with (self.directory / "memory.txt").open("w", encoding="utf-8") as handle:
+            for snap in self.snapshots:
+                handle.write(
+                    f"== {snap.label} @ {snap.elapsed:.2f}s: "
+                    f"current {snap.current / 2**20:.1f} MiB, peak {snap.peak / 2**20:.1f} MiB\n"
+                )
+                handle.writelines(f"  {line}\n" for line in snap.top)
+
+        hot = io.StringIO()
+        pstats.Stats(*self._profiles, stream=hot).sort_stats("tottime").print_stats(
+            TOP_FUNCTIONS
+        )
+        stages = "\n".join(
+            f"  {snap.label:<24} {snap.elapsed:8.2f}s  current {snap.current / 2**20:8.1f} MiB"
+            f"  peak {snap.peak / 2**20:8.1f} MiB"
+            for snap in self.snapshots
+        )
+        return (
+            f"Profile written to {self.directory} (profile.pstats, memory.txt)\n"
+            f"Peak traced memory: {peak / 2**20:.1f} MiB across {len(self._profiles)} profile(s)\n"
+            f"Stage boundaries:\n{stages}\n"
+            f"Hot functions:{hot.getvalue()}"
+        )
+
+
+@contextmanager
+def profiled(directory: Path | None) -> Iterator[None]:
+    """Profile the block when ``directory`` is given; print the summary on exit."""
+    global _active
+    if directory is None:
+        yield
+        return
+    profiler = Profiler(directory)
+    _active = profiler
+    profiler.start()
+    try:
+        yield
+    finally:
+        _active = None
+        print(profiler.stop(), file=sys.stderr)
@@ -1,75 +1,495 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import Iterable
+import random
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name, rowcol_to_a1
 
-from ..events.models import EventRecord
+from ..events.batch import EventBatch
+from ..events.models import EventRecord, canonical_key
+from ..metrics import RunMetrics
+from .index import SheetKey, SheetKeyIndex
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 MASTER_TAB_NAME = "Master"
 HEADER = ["Venue", "Event", "Date", "Artist"]
+KEY_COLUMNS = ("A", "C")
+ROW_COLUMNS = ("A", rowcol_to_a1(1, len(HEADER)).rstrip("1"))
+KEY_CHUNK_ROWS = 5000
+# Rows per values.batchUpdate / values.append call; keeps request bodies well
+# under the API's payload limit.
+WRITE_CHUNK_ROWS = 2000
+UPDATED_RANGE_ROWS = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$")
+QUOTA_STATUSES = frozenset({429, 500, 502, 503})
+MAX_QUOTA_RETRIES = 6
+QUOTA_BACKOFF_BASE = 2.0
+QUOTA_BACKOFF_CAP = 64.0
+
+
+def _row_key(row: list[str]) -> SheetKey:
+    padded = list(row) + [""] * (3 - len(row))
+    return padded[0], padded[1], padded[2]
+
+
+def _keyed_rows(events: Iterable[EventRecord] | EventBatch) -> Iterable[tuple[str, list[str]]]:
+    """``(key, sheet row)`` pairs; a batch is read column-wise without building records."""
+    if isinstance(events, EventBatch):
+        return zip(events.keys, events.sheet_rows())
+    return ((event.key, event.to_sheet_row()) for event in events)
+
+
+def _payload_size(*payloads: Any) -> int:
+    """Approximate JSON bytes of request bodies and responses (worksheet handles count as 0)."""
+    return sum(
+        len(json.dumps(payload, default=str))
+        for payload in payloads
+        if isinstance(payload, (dict, list, str))
+    )
+
+
+@dataclass(slots=True)
+class WriteReport:
+    operation: str
+    rows_written: int = 0
+    read_calls: int = 0
+    write_calls: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
 
 
 class SheetsClient:
-    def __init__(self, spreadsheet_id: str, service_account_file: str) -> None:
-        credentials = Credentials.from_service_account_file(service_account_file, scopes=SCOPES)
-        self._client = gspread.authorize(credentials)
-        self._spreadsheet = self._client.open_by_key(spreadsheet_id)
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        service_account_file: str,
+        index_path: Path | None = None,
+        spreadsheet=None,
+        backoff_base: float = QUOTA_BACKOFF_BASE,
+        metrics: RunMetrics | None = None,
+    ) -> None:
+        """``spreadsheet`` swaps in a pre-built backend (e.g. ``InMemorySpreadsheet``)."""
+        if spreadsheet is None:
+            credentials = Credentials.from_service_account_file(
+                service_account_file, scopes=SCOPES
+            )
+            spreadsheet = gspread.authorize(credentials).open_by_key(spreadsheet_id)
+        self._spreadsheet = spreadsheet
+        self._backoff_base = backoff_base
+        self._metrics = metrics or RunMetrics()
+        self._spreadsheet_id = spreadsheet_id
+        self._index_path = index_path
+        self._worksheets: dict[str, Any] = {}
+        # (rows, columns) per tab as changed by this client's resizes and appends;
+        # gspread's Worksheet only knows the size it was fetched with.
+        self._grid_sizes: dict[str, tuple[int, int]] = {}
+        self._report: WriteReport | None = None
+        self.last_report: WriteReport | None = None
 
     def ensure_header(self) -> None:
-        worksheet = self._get_master_worksheet()
-        existing = worksheet.row_values(1)
-        if existing[: len(HEADER)] != HEADER:
-            worksheet.update(f"A1:{chr(64 + len(HEADER))}1", [HEADER])
-        if worksheet.col_count > len(HEADER):
-            worksheet.resize(rows=worksheet.row_count, cols=len(HEADER))
+        with self._instrumented("ensure_header"):
+            worksheet = self._get_worksheet()
+            header, _ = self._read_header_and_tail(worksheet, None)
+            self._write_rows(worksheet, 2, [], fix_header=header != HEADER)
+
+    def iter_row_chunks(
+        self,
+        chunk_rows: int = KEY_CHUNK_ROWS,
+        columns: tuple[str, str] = ROW_COLUMNS,
+        tab: str = MASTER_TAB_NAME,
+    ) -> Iterator[tuple[int, list[list[str]]]]:
+        """Yield ``(first_row, rows)`` for the data rows, ``chunk_rows`` at a time.
+
+        Only the ``(first, last)`` column range is read.
+        """
+        worksheet = self._get_worksheet(tab)
+        first, last = columns
+        row_count, _ = self._grid_size(worksheet)
+        start_row = 2
+        while start_row <= row_count:
+            end_row = start_row + chunk_rows - 1
+            rows = self._call("read", worksheet.get, f"{first}{start_row}:{last}{end_row}")
+            # The API trims trailing blank rows, so only an empty chunk marks the end.
+            if not rows:
+                return
+            yield start_row, [list(row) for row in rows]
+            start_row = end_row + 1
 
-    def fetch_rows(self) -> list[list[str]]:
-        worksheet = self._get_master_worksheet()
-        return worksheet.get_all_values()
+    def write_ranges(self, updates: list[tuple[str, list[list[str]]]]) -> None:
+        """Write ``(a1_range, values)`` pairs verbatim, batching the requests."""
+        worksheet = self._get_worksheet()
+        data = [
+            {"range": self._range(worksheet, a1), "values": values}
+            for a1, values in updates
+        ]
+        for offset in range(0, len(data), WRITE_CHUNK_ROWS):
+            self._call(
+                "write",
+                self._spreadsheet.values_batch_update,
+                {"valueInputOption": "RAW", "data": data[offset : offset + WRITE_CHUNK_ROWS]},
+            )
+        if data:
+            self._invalidate_index()
 
     def overwrite_rows(self, rows: list[list[str]]) -> None:
-        worksheet = self._get_master_worksheet()
-        worksheet.clear()
-        if rows:
-            worksheet.update("A1", rows)
-        self.ensure_header()
-
-    def upsert_events(self, events: Iterable[EventRecord]) -> int:
-        worksheet = self._get_master_worksheet()
-        self.ensure_header()
-
-        existing_rows = worksheet.get_all_records()
-        existing_keys = {
-            (row.get("Venue", ""), row.get("Event", ""), row.get("Date", ""))
-            for row in existing_rows
-        }
+        """Replace the sheet contents with ``rows`` (header included).
+
+        Values are written before the grid is trimmed, so a failed upload never
+        leaves the sheet empty.
+        """
+        with self._instrumented("overwrite"):
+            worksheet = self._get_worksheet()
+            body = [HEADER] + [list(row) for row in rows[1:]]
+            blank_row = [""] * len(HEADER)
+            self._write_rows(
+                worksheet, 1, body + [blank_row], fix_header=False, value_input_option="RAW"
+            )
+            self._resize_grid(worksheet, len(body) + 1)
+        self._invalidate_index()
+
+    def upsert_events(self, events: Iterable[EventRecord] | EventBatch) -> int:
+        return self.upsert_tabs({MASTER_TAB_NAME: events})[MASTER_TAB_NAME]
+
+    def upsert_tabs(
+        self, events_by_tab: dict[str, Iterable[EventRecord] | EventBatch]
+    ) -> dict[str, int]:
+        """Append unseen events to each tab.
+
+        Key indexes are resolved per tab, header fixes for every tab go out in
+        one ``values.batchUpdate``, then each tab's rows are sent through
+        ``values.append`` (``INSERT_ROWS``), one call per ``WRITE_CHUNK_ROWS``.
+        The server places the rows after the table's real last row, so
+        concurrent runs or manual edits cannot be overwritten.
+        """
+        appended: dict[str, int] = {}
+        with self._instrumented("upsert") as report:
+            plans = []
+            header_fixes = []
+            for tab, events in events_by_tab.items():
+                worksheet = self._get_worksheet(tab)
+                index, header = self._key_index(worksheet)
+                new_rows = []
+                for key, row in _keyed_rows(events):
+                    if key not in index.keys:
+                        new_rows.append(row)
+                        index.keys.add(key)
+                if header != HEADER:
+                    header_fixes.extend(self._row_data(worksheet, 1, [], fix_header=True))
+                plans.append((worksheet, index, new_rows))
+                appended[tab] = len(new_rows)
 
-        new_rows = []
-        for event in events:
-            key = (event.venue, event.event, event.date.strftime("%Y-%m-%d"))
-            if key not in existing_keys:
-                new_rows.append(event.to_sheet_row())
-                existing_keys.add(key)
+            # Headers first: appending to an empty tab would otherwise take row 1.
+            self._flush(header_fixes, "USER_ENTERED")
+            in_place = {
+                worksheet.title: self._append_rows(worksheet, index, rows)
+                for worksheet, index, rows in plans
+                if rows
+            }
+            report.rows_written = sum(appended.values())
 
-        if not new_rows:
+        for worksheet, index, rows in plans:
+            if not rows:
+                continue
+            logger.info("Appended %d new row(s) to %s", len(rows), worksheet.title)
+            if in_place[worksheet.title]:
+                self._save_index(index, worksheet.title)
+            else:
+                logger.info(
+                    "%s gained rows from another writer; its key index will be re-read",
+                    worksheet.title,
+                )
+                self._invalidate_index(worksheet.title)
+        if not report.rows_written:
             logger.info("No new events to append to the sheet.")
-            return 0
+        return appended
+
+    def _append_rows(self, worksheet, index: SheetKeyIndex, rows: list[list[str]]) -> bool:
+        """Append ``rows`` after the table and move ``index`` to the new tail.
+
+        Returns False when the server placed a chunk somewhere other than
+        directly after ``index.last_row``, i.e. someone else wrote rows the
+        index has not seen.
+        """
+        in_place = True
+        table = self._range(worksheet, f"A1:{rowcol_to_a1(1, len(HEADER))}")
+        for offset in range(0, len(rows), WRITE_CHUNK_ROWS):
+            chunk = rows[offset : offset + WRITE_CHUNK_ROWS]
+            response = self._call(
+                "write",
+                self._spreadsheet.values_append,
+                table,
+                {"valueInputOption": "USER_ENTERED", "insertDataOption": "INSERT_ROWS"},
+                {"values": chunk},
+            )
+            updated = (response or {}).get("updates", {}).get("updatedRange", "")
+            match = UPDATED_RANGE_ROWS.search(updated)
+            if match is None:
+                in_place = False
+                continue
+            first_row = int(match.group(1))
+            in_place = in_place and first_row == index.last_row + 1
+            index.last_row = int(match.group(2) or first_row)
+            index.tail = _row_key(chunk[-1])
+            # INSERT_ROWS grows the grid; keep the known size in step for chunked reads.
+            rows_known, cols_known = self._grid_size(worksheet)
+            self._grid_sizes[worksheet.title] = (rows_known + len(chunk), cols_known)
+        return in_place
+
+    @contextmanager
+    def _instrumented(self, operation: str) -> Iterator[WriteReport]:
+        """Collect every API call made inside the block into one report."""
+        if self._report is not None:
+            yield self._report
+            return
+        report = WriteReport(operation=operation)
+        self._report = report
+        started = time.monotonic()
+        try:
+            yield report
+        finally:
+            report.elapsed = time.monotonic() - started
+            self._report = None
+            self.last_report = report
+            logger.info(
+                "Sheets %s: %d row(s) written in %d read + %d write call(s), "
+                "%d quota retr%s, %.2fs",
+                report.operation,
+                report.rows_written,
+                report.read_calls,
+                report.write_calls,
+                report.retries,
+                "y" if report.retries == 1 else "ies",
+                report.elapsed,
+            )
 
-        worksheet.append_rows(new_rows, value_input_option="USER_ENTERED")
-        logger.info("Appended %d new row(s) to %s", len(new_rows), MASTER_TAB_NAME)
-        return len(new_rows)
+    def _call(self, kind: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run one API call, backing off on quota and transient server errors."""
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except gspread.exceptions.APIError as exc:
+                self._metrics.observe_request(
+                    "sheets", time.perf_counter() - started, _payload_size(*args), ok=False
+                )
+                status = exc.response.status_code
+                if status not in QUOTA_STATUSES or attempt >= MAX_QUOTA_RETRIES:
+                    raise
+                retry_after = exc.response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = float(retry_after)
+                else:
+                    ceiling = min(QUOTA_BACKOFF_CAP, self._backoff_base * 2**attempt)
+                    delay = random.uniform(ceiling / 2, ceiling)
+                logger.warning(
+                    "Sheets API returned %d; retrying in %.1fs (%d/%d)",
+                    status,
+                    delay,
+                    attempt + 1,
+                    MAX_QUOTA_RETRIES,
+                )
+                if self._report is not None:
+                    self._report.retries += 1
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._metrics.observe_request(
+                "sheets", time.perf_counter() - started, _payload_size(*args, result)
+            )
+            if self._report is not None:
+                if kind == "read":
+                    self._report.read_calls += 1
+                else:
+                    self._report.write_calls += 1
+            return result
 
-    def _get_master_worksheet(self):
+    def _range(self, worksheet, a1: str) -> str:
+        return absolute_range_name(worksheet.title, a1)
+
+    def _read_header_and_tail(
+        self, worksheet, index: SheetKeyIndex | None
+    ) -> tuple[list[str], list[list[str]] | None]:
+        """Fetch row 1 and, if an index is cached, its tail rows in one call."""
+        first, last = KEY_COLUMNS
+        ranges = [self._range(worksheet, f"A1:{rowcol_to_a1(1, len(HEADER))}")]
+        if index is not None:
+            ranges.append(
+                self._range(worksheet, f"{first}{index.last_row}:{last}{index.last_row + 1}")
+            )
+        response = self._call("read", self._spreadsheet.values_batch_get, ranges)
+        value_ranges = [item.get("values", []) for item in response.get("valueRanges", [])]
+        header_rows = value_ranges[0] if value_ranges else []
+        header = list(header_rows[0][: len(HEADER)]) if header_rows else []
+        tail = value_ranges[1] if index is not None and len(value_ranges) > 1 else None
+        return header, tail
+
+    def _write_rows(
+        self,
+        worksheet,
+        first_row: int,
+        rows: list[list[str]],
+        fix_header: bool,
+        value_input_option: str = "USER_ENTERED",
+    ) -> None:
+        """Write the header fix and ``rows`` with as few API calls as possible.
+
+        At most one ``batchUpdate`` adjusts the grid, followed by one
+        ``values.batchUpdate`` per ``WRITE_CHUNK_ROWS`` rows (the header rides
+        along with the first chunk).
+        """
+        row_count, _ = self._grid_size(worksheet)
+        self._resize_grid(worksheet, max(row_count, first_row + len(rows) - 1))
+        self._flush(self._row_data(worksheet, first_row, rows, fix_header), value_input_option)
+
+    def _row_data(
+        self, worksheet, first_row: int, rows: list[list[str]], fix_header: bool
+    ) -> list[dict]:
+        data: list[dict] = []
+        if fix_header:
+            data.append(
+                {
+                    "range": self._range(worksheet, f"A1:{rowcol_to_a1(1, len(HEADER))}"),
+                    "values": [HEADER],
+                }
+            )
+        for offset in range(0, len(rows), WRITE_CHUNK_ROWS):
+            chunk = rows[offset : offset + WRITE_CHUNK_ROWS]
+            start = first_row + offset
+            end = rowcol_to_a1(start + len(chunk) - 1, len(HEADER))
+            data.append({"range": self._range(worksheet, f"A{start}:{end}"), "values": chunk})
+        return data
+
+    def _flush(self, data: list[dict], value_input_option: str) -> None:
+        """Send ranges in ``values.batchUpdate`` calls of up to ``WRITE_CHUNK_ROWS`` rows."""
+        batch: list[dict] = []
+        batch_rows = 0
+        for item in data:
+            if batch and batch_rows + len(item["values"]) > WRITE_CHUNK_ROWS:
+                self._call(
+                    "write",
+                    self._spreadsheet.values_batch_update,
+                    {"valueInputOption": value_input_option, "data": batch},
+                )
+                batch, batch_rows = [], 0
+            batch.append(item)
+            batch_rows += len(item["values"])
+        if batch:
+            self._call(
+                "write",
+                self._spreadsheet.values_batch_update,
+                {"valueInputOption": value_input_option, "data": batch},
+            )
+
+    def _grid_size(self, worksheet) -> tuple[int, int]:
+        return self._grid_sizes.setdefault(
+            worksheet.title, (worksheet.row_count, worksheet.col_count)
+        )
+
+    def _resize_grid(self, worksheet, rows: int) -> None:
+        self._resize_grids([(worksheet, rows)])
+
+    def _resize_grids(self, targets: list[tuple[Any, int]]) -> None:
+        """Resize several worksheets to ``HEADER`` width in one ``batchUpdate``."""
+        cols = len(HEADER)
+        pending = [
+            (worksheet, rows)
+            for worksheet, rows in targets
+            if (rows, cols) != self._grid_size(worksheet)
+        ]
+        if not pending:
+            return
+        body = {
+            "requests": [
+                {
+                    "updateSheetProperties": {
+                        "properties": {
+                            "sheetId": worksheet.id,
+                            "gridProperties": {"rowCount": rows, "columnCount": cols},
+                        },
+                        "fields": "gridProperties/rowCount,gridProperties/columnCount",
+                    }
+                }
+                for worksheet, rows in pending
+            ]
+        }
+        self._call("write", self._spreadsheet.batch_update, body)
+        for worksheet, rows in pending:
+            self._grid_sizes[worksheet.title] = (rows, cols)
+
+    def _key_index(self, worksheet) -> tuple[SheetKeyIndex, list[str]]:
+        """Return the sheet's keys and header, re-reading key columns only when needed."""
+        cached = None
+        index_path = self._tab_index_path(worksheet.title)
+        if index_path is not None:
+            cached = SheetKeyIndex.load(index_path, self._spreadsheet_id, worksheet.id)
+
+        header, tail = self._read_header_and_tail(worksheet, cached)
+        if cached is not None and self._index_is_current(cached, tail):
+            logger.info("Using cached key index (%d row(s))", len(cached.keys))
+            self._metrics.increment("sheet_index_hits")
+            return cached, header
+        self._metrics.increment("sheet_index_misses")
+
+        index = self._read_key_index(worksheet)
+        self._save_index(index, worksheet.title)
+        return index, header
+
+    @staticmethod
+    def _index_is_current(index: SheetKeyIndex, tail: list[list[str]] | None) -> bool:
+        rows = tail or []
+        if index.tail is None:
+            return index.last_row == 1 and len(rows) <= 1
+        return len(rows) == 1 and _row_key(rows[0]) == index.tail
+
+    def _read_key_index(self, worksheet) -> SheetKeyIndex:
+        index = SheetKeyIndex(spreadsheet_id=self._spreadsheet_id, worksheet_id=worksheet.id)
+        for first_row, rows in self.iter_row_chunks(columns=KEY_COLUMNS, tab=worksheet.title):
+            index.last_row = first_row - 1
+            for row in rows:
+                cells = _row_key(row)
+                index.add(canonical_key(*cells), cells)
+        logger.info("Read %d key(s) from %s", len(index.keys), worksheet.title)
+        return index
+
+    def _tab_index_path(self, tab: str) -> Path | None:
+        """Master keeps ``index_path``; other tabs get a sibling file per tab."""
+        if self._index_path is None or tab == MASTER_TAB_NAME:
+            return self._index_path
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", tab).strip("-").lower()
+        return self._index_path.with_name(
+            f"{self._index_path.stem}.{slug}{self._index_path.suffix}"
+        )
+
+    def _save_index(self, index: SheetKeyIndex, tab: str = MASTER_TAB_NAME) -> None:
+        index_path = self._tab_index_path(tab)
+        if index_path is not None:
+            index.save(index_path)
+
+    def _invalidate_index(self, tab: str = MASTER_TAB_NAME) -> None:
+        index_path = self._tab_index_path(tab)
+        if index_path is not None:
+            index_path.unlink(missing_ok=True)
+
+    def _get_worksheet(self, title: str = MASTER_TAB_NAME):
+        worksheet = self._worksheets.get(title)
+        if worksheet is not None:
+            return worksheet
         try:
-            return self._spreadsheet.worksheet(MASTER_TAB_NAME)
+            worksheet = self._call("read", self._spreadsheet.worksheet, title)
         except gspread.WorksheetNotFound as exc:
             raise RuntimeError(
-                f"Worksheet '{MASTER_TAB_NAME}' not found. Please create it manually."
+                f"Worksheet '{title}' not found. Please create it manually."
             ) from exc
-
+        self._worksheets[title] = worksheet
+        return worksheet
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..events.models import canonical_key
+
+logger = logging.getLogger(__name__)
+
+SheetKey = tuple[str, str, str]
+INDEX_VERSION = 2
+
+
+@dataclass(slots=True)
+class SheetKeyIndex:
+    """Locally persisted event keys (``canonical_key`` of each row) for one worksheet.
+
+    ``last_row`` is the 1-based sheet row of the last data row and ``tail`` its
+    exact (Venue, Event, Date) cells, which together let the client confirm the
+    sheet hasn't grown or been rewritten with a single one-row read.
+    """
+
+    spreadsheet_id: str
+    worksheet_id: int
+    last_row: int = 1
+    tail: SheetKey | None = None
+    keys: set[str] = field(default_factory=set)
+
+    def add(self, key: str, row: SheetKey) -> None:
+        self.keys.add(key)
+        self.last_row += 1
+        self.tail = row
+
+    @classmethod
+    def load(cls, path: Path, spreadsheet_id: str, worksheet_id: int) -> "SheetKeyIndex | None":
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if raw.get("spreadsheet_id") != spreadsheet_id or raw.get("worksheet_id") != worksheet_id:
+            return None
+        keys = raw["keys"]
+        if raw.get("version") != INDEX_VERSION:
+            # v1 stored the raw (Venue, Event, Date) cells of every row.
+            keys = [canonical_key(*key) for key in keys]
+        return cls(
+            spreadsheet_id=spreadsheet_id,
+            worksheet_id=worksheet_id,
+            last_row=raw["last_row"],
+            tail=tuple(raw["tail"]) if raw.get("tail") else None,
+            keys=set(keys),
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "spreadsheet_id": self.spreadsheet_id,
+            "worksheet_id": self.worksheet_id,
+            "last_row": self.last_row,
+            "tail": list(self.tail) if self.tail else None,
+            "keys": sorted(self.keys),
+        }
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, path)
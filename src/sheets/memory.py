@@ -0,0 +1,208 @@
+"""In-memory stand-in for a gspread ``Spreadsheet``.
+
+Implements just the calls ``SheetsClient`` makes, so the real client logic
+(key index, batching, diffing) can run without Google credentials or network.
+Optional latency and error injection make it usable for load tests.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from typing import Any, Callable
+
+import gspread
+import requests
+from gspread.utils import a1_range_to_grid_range
+
+DEFAULT_ROWS = 1000
+DEFAULT_COLS = 26
+
+
+def _split_range(name: str) -> tuple[str | None, str]:
+    if "!" not in name:
+        return None, name
+    title, a1 = name.rsplit("!", 1)
+    return title.strip("'").replace("''", "'"), a1
+
+
+def _trim(rows: list[list[str]]) -> list[list[str]]:
+    """Mimic the API: drop trailing empty cells and trailing empty rows."""
+    trimmed = []
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        trimmed.append(row[:end])
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+def _quota_error() -> gspread.exceptions.APIError:
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps(
+        {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+    ).encode("utf-8")
+    return gspread.exceptions.APIError(response)
+
+
+class InMemoryWorksheet:
+    def __init__(
+        self, sheet_id: int, title: str, on_call: Callable[[], None] = lambda: None
+    ) -> None:
+        self.id = sheet_id
+        self.title = title
+        self._on_call = on_call
+        self._properties = {
+            "gridProperties": {"rowCount": DEFAULT_ROWS, "columnCount": DEFAULT_COLS}
+        }
+        self.cells: list[list[str]] = []
+
+    @property
+    def row_count(self) -> int:
+        return self._properties["gridProperties"]["rowCount"]
+
+    @property
+    def col_count(self) -> int:
+        return self._properties["gridProperties"]["columnCount"]
+
+    def _bounds(self, a1: str) -> tuple[int, int, int, int]:
+        grid = a1_range_to_grid_range(a1)
+        return (
+            grid.get("startRowIndex", 0),
+            min(grid.get("endRowIndex", self.row_count), self.row_count),
+            grid.get("startColumnIndex", 0),
+            min(grid.get("endColumnIndex", self.col_count), self.col_count),
+        )
+
+    def get(self, a1: str) -> list[list[str]]:
+        self._on_call()
+        return self.read(a1)
+
+    def read(self, a1: str) -> list[list[str]]:
+        """``get`` without the simulated API call, for use by the spreadsheet."""
+        row_start, row_end, col_start, col_end = self._bounds(a1)
+        return _trim(
+            [list(row[col_start:col_end]) for row in self.cells[row_start:row_end]]
+        )
+
+    def get_all_values(self) -> list[list[str]]:
+        self._on_call()
+        width = max((len(row) for row in self.cells), default=0)
+        return [row + [""] * (width - len(row)) for row in _trim(self.cells)]
+
+    def write(self, a1: str, values: list[list[Any]]) -> None:
+        row_start, _, col_start, _ = self._bounds(a1)
+        if row_start + len(values) > self.row_count:
+            raise gspread.exceptions.GSpreadException(
+                f"Range {a1} exceeds grid limits. Max rows: {self.row_count}"
+            )
+        for offset, row in enumerate(values):
+            index = row_start + offset
+            while len(self.cells) <= index:
+                self.cells.append([])
+            target = self.cells[index]
+            if len(target) < col_start + len(row):
+                target.extend([""] * (col_start + len(row) - len(target)))
+            target[col_start : col_start + len(row)] = ["" if v is None else str(v) for v in row]
+
+    def resize(self, rows: int, cols: int) -> None:
+        self._properties["gridProperties"] = {"rowCount": rows, "columnCount": cols}
+        self.cells = [row[:cols] for row in self.cells[:rows]]
+
+
+class InMemorySpreadsheet:
+    """``latency`` seconds are slept per API call and ``error_rate`` of calls
+    fail with a 429 quota error, to exercise the client's backoff."""
+
+    def __init__(
+        self,
+        titles: tuple[str, ...] = ("Master",),
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._worksheets = {
+            title: InMemoryWorksheet(index, title, self._simulate)
+            for index, title in enumerate(titles)
+        }
+
+    def _simulate(self) -> None:
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise _quota_error()
+
+    def worksheet(self, title: str) -> InMemoryWorksheet:
+        self._simulate()
+        return self._lookup(title)
+
+    def _lookup(self, title: str) -> InMemoryWorksheet:
+        try:
+            return self._worksheets[title]
+        except KeyError as exc:
+            raise gspread.WorksheetNotFound(title) from exc
+
+    def _resolve(self, name: str) -> tuple[InMemoryWorksheet, str]:
+        title, a1 = _split_range(name)
+        worksheet = self._lookup(title) if title else next(iter(self._worksheets.values()))
+        return worksheet, a1
+
+    def values_batch_get(self, ranges: list[str], params: dict | None = None) -> dict:
+        self._simulate()
+        with self._lock:
+            value_ranges = []
+            for name in ranges:
+                worksheet, a1 = self._resolve(name)
+                value_ranges.append({"range": name, "values": worksheet.read(a1)})
+        return {"valueRanges": value_ranges}
+
+    def values_batch_update(self, body: dict) -> dict:
+        self._simulate()
+        with self._lock:
+            for item in body.get("data", []):
+                worksheet, a1 = self._resolve(item["range"])
+                worksheet.write(a1, item["values"])
+        return {"totalUpdatedRanges": len(body.get("data", []))}
+
+    def values_append(self, range: str, params: dict, body: dict) -> dict:
+        """Insert ``body['values']`` after the last non-empty row (``INSERT_ROWS``)."""
+        self._simulate()
+        values = body.get("values", [])
+        with self._lock:
+            worksheet, _ = self._resolve(range)
+            start = len(_trim(worksheet.cells))
+            worksheet.cells[start:start] = [[] for _ in values]
+            worksheet._properties["gridProperties"]["rowCount"] += len(values)
+            worksheet.write(f"A{start + 1}", values)
+        width = max((len(row) for row in values), default=1)
+        first, last = f"A{start + 1}", f"{chr(ord('A') + width - 1)}{start + len(values)}"
+        title = worksheet.title.replace("'", "''")
+        return {"updates": {"updatedRange": f"'{title}'!{first}:{last}", "updatedRows": len(values)}}
+
+    def batch_update(self, body: dict) -> dict:
+        self._simulate()
+        with self._lock:
+            for request in body.get("requests", []):
+                update = request.get("updateSheetProperties")
+                if not update:
+                    raise NotImplementedError(f"Unsupported request: {request}")
+                properties = update["properties"]
+                worksheet = next(
+                    ws for ws in self._worksheets.values() if ws.id == properties["sheetId"]
+                )
+                grid = properties["gridProperties"]
+                worksheet.resize(grid["rowCount"], grid["columnCount"])
+        return {"replies": [{} for _ in body.get("requests", [])]}
@@ -0,0 +1 @@
+"""Shared HTTP transport."""
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    unchanged: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    bytes_saved: int = 0
+
+
+class HttpCache:
+    """On-disk response cache revalidated with conditional requests.
+
+    Each entry is a ``<key>.json`` metadata file plus a ``<key>.body`` payload.
+    ``If-None-Match``/``If-Modified-Since`` are sent when the stored response had
+    validators; a content hash still lets us spot unchanged payloads from
+    endpoints that ignore them.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_age: float = 14 * 24 * 3600,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(method: str, url: str, body: object = None) -> str:
+        digest = hashlib.sha256(f"{method.upper()} {url}".encode("utf-8"))
+        if body is not None:
+            digest.update(json.dumps(body, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _load_meta(self, key: str) -> dict | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not body_path.exists() or time.time() - meta.get("stored_at", 0) > self.max_age:
+            return None
+        return meta
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        meta = self._load_meta(key)
+        if not meta:
+            return {}
+        headers = {}
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    def resolve(self, key: str, response: requests.Response) -> requests.Response:
+        """Serve a 304 from disk, or store a fresh 200 and return it.
+
+        A 304 whose entry is no longer usable comes back unchanged; the caller
+        has to repeat the request without validators.
+        """
+        if response.status_code == 304:
+            cached = self._load_response(key, response.url)
+            if cached is not None:
+                with self._lock:
+                    self.stats.hits += 1
+                    self.stats.bytes_saved += len(cached.content)
+                return cached
+        if response.status_code != 200:
+            return response
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        previous = self._load_meta(key)
+        with self._lock:
+            if previous and previous.get("content_hash") == content_hash:
+                self.stats.unchanged += 1
+            else:
+                self.stats.misses += 1
+            self.stats.stored += 1
+        self._store(key, response, content, content_hash)
+        return response
+
+    def _load_response(self, key: str, url: str) -> requests.Response | None:
+        meta = self._load_meta(key)
+        if meta is None:
+            return None
+        meta_path, body_path = self._paths(key)
+        try:
+            content = body_path.read_bytes()
+        except OSError:
+            # Pruned between the metadata check and the read.
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta.get("encoding")
+        response.url = meta.get("url", url)
+        os.utime(meta_path)
+        return response
+
+    def _store(
+        self, key: str, response: requests.Response, content: bytes, content_hash: str
+    ) -> None:
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "url": response.url,
+            "stored_at": time.time(),
+            "content_hash": content_hash,
+            "encoding": response.encoding,
+            "headers": {
+                name: response.headers[name]
+                for name in STORED_HEADERS
+                if name in response.headers
+            },
+        }
+        for path, data in ((body_path, content), (meta_path, json.dumps(meta).encode("utf-8"))):
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used ones over the size cap."""
+        now = time.time()
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                stat = meta_path.stat()
+                size = stat.st_size + (body_path.stat().st_size if body_path.exists() else 0)
+                stored_at = json.loads(meta_path.read_text(encoding="utf-8")).get("stored_at", 0)
+            except (OSError, json.JSONDecodeError):
+                stored_at, size, stat = 0, 0, None
+            entries.append((stat.st_mtime if stat else 0, meta_path, body_path, size, stored_at))
+
+        entries.sort()
+        total = sum(entry[3] for entry in entries)
+        removed = 0
+        for _, meta_path, body_path, size, stored_at in entries:
+            if now - stored_at <= self.max_age and total <= self.max_bytes:
+                continue
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self.stats.evicted += removed
+        return removed
+
+    def report(self) -> dict[str, int]:
+        self.prune()
+        stats = asdict(self.stats)
+        logger.info(
+            "HTTP cache: %d hit(s), %d unchanged, %d miss(es), %d evicted, %.1f KiB saved",
+            stats["hits"],
+            stats["unchanged"],
+            stats["misses"],
+            stats["evicted"],
+            stats["bytes_saved"] / 1024,
+        )
+        return stats
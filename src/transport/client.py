@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..metrics import RunMetrics
+from .cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Throttling: retried after Retry-After, but never counted against the breaker.
+THROTTLE_STATUS = 429
+# Longest Retry-After the transport will sleep for.
+RETRY_AFTER_CAP = 60.0
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host has failed too often and is cooling down."""
+
+
+def _retry_after_seconds(value: str) -> float | None:
+    """Retry-After as delta-seconds or an HTTP date; None when absent or invalid."""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    if not value:
+        return None
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Counts failed requests (not attempts) per host.
+
+    After ``cooldown`` an open breaker lets exactly one trial request through
+    and re-arms the cooldown for everyone else; the trial's outcome closes or
+    re-opens it. A trial that never reports back only delays the next one.
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._half_open = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.cooldown:
+                self._opened_at = now
+                self._half_open = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open = False
+
+    def record_failure(self) -> bool:
+        """Returns True when this failure opens (or re-opens) the breaker."""
+        with self._lock:
+            self._failures += 1
+            if self._half_open:
+                self._opened_at = time.monotonic()
+                self._half_open = False
+                return True
+            if self._failures >= self.threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class HttpTransport:
+    """Pooled ``requests`` session with retries, per-host throttling and a breaker.
+
+    Exposes ``get``/``post`` with the ``requests.Session`` signature so it can be
+    handed to anything that previously took a session.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 10.0,
+        rate_per_host: float = 5.0,
+        burst: int = 10,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+        timeout: float = 20.0,
+        cache: HttpCache | None = None,
+        metrics: RunMetrics | None = None,
+    ) -> None:
+        self.cache = cache
+        self.metrics = metrics or RunMetrics()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def _host_state(self, url: str) -> tuple[TokenBucket, CircuitBreaker]:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+                self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_cooldown
+                )
+            return self._buckets[host], self._breakers[host]
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        if response is not None:
+            retry_after = _retry_after_seconds(response.headers.get("Retry-After", ""))
+            if retry_after is not None:
+                return min(RETRY_AFTER_CAP, retry_after)
+        ceiling = min(self.backoff_cap, self.backoff_base * (2**attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        if self.cache is None or method not in {"GET", "POST"}:
+            return self._send(method, url, **kwargs)
+
+        key = self.cache.key_for(method, url, kwargs.get("json"))
+        validators = self.cache.conditional_headers(key)
+        if not validators:
+            return self.cache.resolve(key, self._send(method, url, **kwargs))
+
+        headers = kwargs.get("headers")
+        response = self.cache.resolve(
+            key, self._send(method, url, **{**kwargs, "headers": {**(headers or {}), **validators}})
+        )
+        if response.status_code == 304:
+            # The entry expired or lost its body after the validators were read,
+            # so there is nothing to serve the 304 from; ask for the full body.
+            logger.info("%s %s: 304 without a cached body; re-sending unconditionally", method, url)
+            response = self.cache.resolve(key, self._send(method, url, **kwargs))
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """One request, retried; the breaker sees a single outcome per request.
+
+        A 429 (even after the last retry) means the host is up but throttling,
+        so it is backed off per Retry-After and counted as a success.
+        """
+        bucket, breaker = self._host_state(url)
+        if not breaker.allow():
+            self.metrics.increment("http_circuit_open")
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+        try:
+            response = self._send_with_retries(method, url, bucket, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self._record_failure(breaker, url)
+            raise
+        if response.status_code in RETRY_STATUSES and response.status_code != THROTTLE_STATUS:
+            self._record_failure(breaker, url)
+        else:
+            breaker.record_success()
+        return response
+
+    def _record_failure(self, breaker: CircuitBreaker, url: str) -> None:
+        if breaker.record_failure():
+            logger.warning("Opening circuit for %s after repeated failures", url)
+
+    def _send_with_retries(
+        self, method: str, url: str, bucket: TokenBucket, **kwargs: Any
+    ) -> requests.Response:
+        attempt = 0
+        while True:
+            bucket.acquire()
+
+            response: requests.Response | None = None
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error: Exception | None = exc
+            else:
+                error = None
+            self.metrics.observe_request(
+                "site",
+                time.perf_counter() - started,
+                len(response.content) if response is not None else 0,
+                ok=response is not None and response.status_code < 400,
+            )
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+
+            if attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self._backoff(attempt, response)
+            logger.info(
+                "%s %s failed (%s); retry %d/%d in %.1fs",
+                method,
+                url,
+                error or response.status_code,
+                attempt + 1,
+                self.max_retries,
+                delay,
+            )
+            self.metrics.increment("http_retries")
+            if response is not None and response.status_code == THROTTLE_STATUS:
+                self.metrics.increment("http_throttled")
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        if self.cache is not None:
+            stats = self.cache.report()
+            # Only 304s served from disk saved a download; "unchanged" responses
+            # were downloaded in full and merely hashed the same.
+            self.metrics.increment("http_cache_hits", stats["hits"])
+            self.metrics.increment("http_cache_unchanged", stats["unchanged"])
+            self.metrics.increment("http_cache_misses", stats["misses"])
+        self.session.close()
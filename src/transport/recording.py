@@ -0,0 +1,124 @@
+"""Record site traffic to disk and replay it without network access."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .cache import HttpCache
+from .client import HttpTransport
+
+logger = logging.getLogger(__name__)
+
+WINDOW_ARTIFACT = "window.json"
+
+
+class Recorder:
+    """Reads and writes one recording directory.
+
+    HTTP exchanges live under ``http/`` keyed like the response cache
+    (method, URL and JSON body), so a replayed run finds them by making the
+    same requests. Other run artifacts (the ``esRequest`` block, browser page
+    source) are stored by name at the top level, next to the run's date
+    window: the /es/v2 requests carry it, so a recording only replays for the
+    window it was made with.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._http_dir = directory / "http"
+        self._lock = threading.Lock()
+
+    def save_response(
+        self, method: str, url: str, body: object, response: requests.Response
+    ) -> None:
+        key = HttpCache.key_for(method, url, body)
+        meta = {
+            "method": method,
+            "url": url,
+            "body": body,
+            "status": response.status_code,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+        }
+        with self._lock:
+            self._http_dir.mkdir(parents=True, exist_ok=True)
+            (self._http_dir / f"{key}.body").write_bytes(response.content)
+            (self._http_dir / f"{key}.json").write_text(
+                json.dumps(meta, indent=2), encoding="utf-8"
+            )
+
+    def load_response(self, method: str, url: str, body: object) -> requests.Response | None:
+        key = HttpCache.key_for(method, url, body)
+        meta_path = self._http_dir / f"{key}.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response._content = (self._http_dir / f"{key}.body").read_bytes()
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta["encoding"]
+        response.url = url
+        return response
+
+    def save_artifact(self, name: str, text: str) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / name).write_text(text, encoding="utf-8")
+
+    def load_artifact(self, name: str) -> str | None:
+        path = self.directory / name
+        return path.read_text(encoding="utf-8") if path.exists() else None
+
+    def save_window(self, start: date, end: date) -> None:
+        window = {"start": start.isoformat(), "end": end.isoformat()}
+        self.save_artifact(WINDOW_ARTIFACT, json.dumps(window))
+
+    def load_window(self) -> tuple[date, date] | None:
+        """The recorded run's ``(start, end)``; None for recordings made before it was saved."""
+        raw = self.load_artifact(WINDOW_ARTIFACT)
+        if raw is None:
+            return None
+        window = json.loads(raw)
+        return date.fromisoformat(window["start"]), date.fromisoformat(window["end"])
+
+
+class RecordingTransport(HttpTransport):
+    def __init__(self, recorder: Recorder, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        response = super().request(method, url, **kwargs)
+        self.recorder.save_response(method, url, kwargs.get("json"), response)
+        return response
+
+
+class ReplayTransport:
+    """Serves recorded responses; anything not recorded fails like a dropped connection."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        self.recorder = recorder
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        response = self.recorder.load_response(method, url, kwargs.get("json"))
+        if response is None:
+            raise requests.ConnectionError(f"No recording for {method} {url}")
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        pass
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
-from typing import Iterable
+from typing import Iterable, Sequence
 
+from ..events.batch import EventBatch
 from ..events.models import EventRecord
 
 
@@ -15,6 +16,9 @@ class ValidationResult:
 
 
 REQUIRED_FIELDS = ("venue", "event", "artist")
+# EventBatch column holding each required field.
+REQUIRED_COLUMNS = ("venues", "events", "artists")
+OUT_OF_RANGE = "Event date is outside the requested range."
 
 
 def validate_event(event: EventRecord, start: date, end: date) -> ValidationResult:
@@ -28,7 +32,7 @@ def validate_event(event: EventRecord, start: date, end: date) -> ValidationResu
             errors.append(f"{field_name.title()} is required.")
 
     if event.date < start or event.date > end:
-        errors.append("Event date is outside the requested range.")
+        errors.append(OUT_OF_RANGE)
 
     return ValidationResult(event=event, is_valid=not errors, errors=errors)
 
@@ -48,3 +52,53 @@ def filter_valid_events(
 
     return valid, failures
 
+
+def filter_valid_batch(
+    batch: EventBatch,
+    start: date,
+    end: date,
+    records: Sequence[EventRecord] | None = None,
+) -> tuple[EventBatch, list[ValidationResult]]:
+    """``filter_valid_events`` over columns: same rules and messages.
+
+    The valid rows stay a batch. ``records``, when given, are the records the
+    batch was built from and are reused for the failure report; otherwise the
+    failing rows are rebuilt from the batch.
+    """
+    in_window = batch.in_window(start, end)
+    # Blank cells are rare; only build per-row masks for columns that have one.
+    blanks = {
+        field_name: batch.blank(column)
+        for field_name, column in zip(REQUIRED_FIELDS, REQUIRED_COLUMNS)
+        if batch.has_blank(column)
+    }
+    ok = in_window
+    if blanks:
+        ok = [passed and not any(row) for passed, *row in zip(in_window, *blanks.values())]
+
+    failed = EventBatch.rejected(ok)
+    if not failed:
+        return batch, []
+
+    if records is None:
+        failed_records = batch.take(failed).to_records()
+    else:
+        failed_records = [records[index] for index in failed]
+    if blanks:
+        failures = []
+        for index, record in zip(failed, failed_records):
+            errors = [
+                f"{field_name.title()} is required."
+                for field_name in REQUIRED_FIELDS
+                if field_name in blanks and blanks[field_name][index]
+            ]
+            if not in_window[index]:
+                errors.append(OUT_OF_RANGE)
+            failures.append(ValidationResult(event=record, is_valid=False, errors=errors))
+    else:
+        # Without blank cells every failure is a date outside the window.
+        failures = [
+            ValidationResult(event=record, is_valid=False, errors=[OUT_OF_RANGE])
+            for record in failed_records
+        ]
+    return batch.take(EventBatch.selected(ok)), failures